@@ -0,0 +1,152 @@
+"""Startup benchmark for the Clyp installer.
+
+Measures how long install.py (or the Nuitka-built executable) takes from
+process start to its first interpreter probe, plus the import cost of the
+modules it may load, and fails when a budget is exceeded:
+
+    python bench_startup.py --budget-ms 400 --import-budget-ms 60
+    python bench_startup.py --exe ./install.bin --runs 10
+
+The probe target defaults to the Python running this script.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, "install.py")
+
+# Import costs tracked per module; "install" is the headless import of the script itself
+IMPORTS = {
+    "install": "import install",
+    "PySide6": "import PySide6.QtWidgets",
+    "install_gui": "import install_gui",
+    "inquirer": "import inquirer",
+    "datetime": "import datetime",
+    "platform": "import platform; platform.system()",
+}
+
+DEFAULT_RUNS = 5
+DEFAULT_BUDGET_MS = 500.0
+DEFAULT_IMPORT_BUDGET_MS = 80.0
+
+# Per-import budgets only apply to modules on the console/silent startup path
+BUDGETED_IMPORTS = ("install", "datetime", "platform")
+
+def import_cost_ms(statement, python=sys.executable):
+    """Cumulative import time of statement's modules via -X importtime, or None if missing."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", statement],
+        cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    if result.returncode != 0:
+        return None
+    total = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", top level has no indent
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() and not parts[2].startswith("  "):
+            try:
+                total += int(parts[1])
+            except ValueError:
+                pass
+    return total / 1000.0
+
+def time_to_first_probe_ms(cmd, runs):
+    """Wall time of each run of cmd (which must exit after its first probe), in ms."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(cmd, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000.0)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(cmd)} exited with {result.returncode}")
+    return timings
+
+def parse_args(argv):
+    options = {
+        "runs": DEFAULT_RUNS,
+        "budget_ms": DEFAULT_BUDGET_MS,
+        "import_budget_ms": DEFAULT_IMPORT_BUDGET_MS,
+        "exe": None,
+        "python": sys.executable,
+        "json": None,
+    }
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == "--runs" and i + 1 < len(argv):
+            options["runs"] = max(1, int(argv[i + 1]))
+            i += 1
+        elif arg == "--budget-ms" and i + 1 < len(argv):
+            options["budget_ms"] = float(argv[i + 1])
+            i += 1
+        elif arg == "--import-budget-ms" and i + 1 < len(argv):
+            options["import_budget_ms"] = float(argv[i + 1])
+            i += 1
+        elif arg == "--exe" and i + 1 < len(argv):
+            options["exe"] = argv[i + 1]
+            i += 1
+        elif arg == "--python" and i + 1 < len(argv):
+            options["python"] = argv[i + 1]
+            i += 1
+        elif arg == "--json" and i + 1 < len(argv):
+            options["json"] = argv[i + 1]
+            i += 1
+        i += 1
+    return options
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    failures = []
+    report = {"imports": {}, "startup": {}}
+
+    print("Import cost (ms):")
+    # Interpreter startup (site, encodings) shows up in every measurement
+    baseline = import_cost_ms("pass") or 0.0
+    for name, statement in IMPORTS.items():
+        cost = import_cost_ms(statement)
+        if cost is not None:
+            cost = max(0.0, cost - baseline)
+        report["imports"][name] = cost
+        if cost is None:
+            print(f"  {name:<12} not installed")
+            continue
+        over = name in BUDGETED_IMPORTS and cost > options["import_budget_ms"]
+        print(f"  {name:<12} {cost:8.1f}{'  OVER BUDGET' if over else ''}")
+        if over:
+            failures.append(f"import {name} took {cost:.1f} ms (budget {options['import_budget_ms']:.0f} ms)")
+
+    probe_args = ["--probe-only", "--python", options["python"]]
+    targets = {"script": [sys.executable, SCRIPT] + probe_args}
+    if options["exe"]:
+        targets["executable"] = [options["exe"]] + probe_args
+
+    print("Time to first probe (ms):")
+    for name, cmd in targets.items():
+        for cache in ("cold", "warm"):
+            # cold bypasses the interpreter cache so the probe really spawns
+            run_cmd = cmd + (["--no-cache"] if cache == "cold" else [])
+            timings = time_to_first_probe_ms(run_cmd, options["runs"])
+            median = statistics.median(timings)
+            report["startup"][f"{name}-{cache}"] = {"median_ms": median, "min_ms": min(timings), "runs": timings}
+            over = median > options["budget_ms"]
+            print(f"  {name + ' (' + cache + ')':<22} median {median:8.1f}  min {min(timings):8.1f}"
+                  f"{'  OVER BUDGET' if over else ''}")
+            if over:
+                failures.append(f"{name} ({cache}) took {median:.1f} ms (budget {options['budget_ms']:.0f} ms)")
+
+    if options["json"]:
+        report["failures"] = failures
+        with open(options["json"], "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,15 @@
 # Build script for Windows using Nuitka compiler
+#
+# Usage: .\build.ps1 [-BundleWheels [-ClypVersion VERSION]]
+#
+# -BundleWheels prefetches clyp and its dependencies as wheels for the
+# build interpreter and embeds them in a onefile executable, so installs
+# into a matching Python need no downloads.
+
+param(
+    [switch]$BundleWheels,
+    [string]$ClypVersion = ""
+)
 
 # Check if Nuitka is installed
 if (-not (python -m nuitka --version 2>$null)) {
@@ -6,8 +17,29 @@ if (-not (python -m nuitka --version 2>$null)) {
     exit 1
 }
 
+$nuitkaArgs = @("--follow-import-to=install_gui")
+
+if ($BundleWheels) {
+    $bundleDir = "build\bundled_wheels"
+    if (Test-Path $bundleDir) { Remove-Item -Recurse -Force $bundleDir }
+    $python = (Get-Command python).Source
+    $prefetchArgs = @("install.py", "--prefetch", "--python", $python, "--wheelhouse", $bundleDir)
+    if ($ClypVersion) { $prefetchArgs += @("--version", $ClypVersion) }
+    python @prefetchArgs
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "Prefetching wheels failed."
+        exit 1
+    }
+    # Only the wheels and their index are shipped, not the object store
+    $nuitkaArgs += @(
+        "--onefile",
+        "--include-data-dir=$bundleDir\wheels=bundled_wheels\wheels",
+        "--include-data-files=$bundleDir\index.json=bundled_wheels\index.json"
+    )
+}
+
 # Compile the project
-python -m nuitka install.py
+python -m nuitka @nuitkaArgs install.py
 
 if ($LASTEXITCODE -eq 0) {
     Write-Host "Build succeeded."
@@ -1,6 +1,23 @@
 #!/bin/sh
 
 # Build script for Linux/macOS using Nuitka compiler
+#
+# Usage: ./build.sh [--bundle-wheels [--clyp-version VERSION]]
+#
+# --bundle-wheels prefetches clyp and its dependencies as wheels for the
+# build interpreter and embeds them in a onefile executable, so installs
+# into a matching Python need no downloads.
+
+bundle_wheels=0
+clyp_version=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --bundle-wheels) bundle_wheels=1 ;;
+        --clyp-version) clyp_version="$2"; shift ;;
+        *) echo "Unknown option: $1"; exit 2 ;;
+    esac
+    shift
+done
 
 # Check if Nuitka is installed
 if ! python -m nuitka --version >/dev/null 2>&1; then
@@ -8,8 +25,28 @@ if ! python -m nuitka --version >/dev/null 2>&1; then
     exit 1
 fi
 
+set -- --follow-import-to=install_gui
+
+if [ $bundle_wheels -eq 1 ]; then
+    bundle_dir=build/bundled_wheels
+    rm -rf "$bundle_dir"
+    if [ -n "$clyp_version" ]; then
+        python install.py --prefetch --python "$(command -v python)" --wheelhouse "$bundle_dir" --version "$clyp_version"
+    else
+        python install.py --prefetch --python "$(command -v python)" --wheelhouse "$bundle_dir"
+    fi
+    if [ $? -ne 0 ]; then
+        echo "Prefetching wheels failed."
+        exit 1
+    fi
+    # Only the wheels and their index are shipped, not the object store
+    set -- "$@" --onefile \
+        "--include-data-dir=$bundle_dir/wheels=bundled_wheels/wheels" \
+        "--include-data-files=$bundle_dir/index.json=bundled_wheels/index.json"
+fi
+
 # Compile the project
-python -m nuitka install.py
+python -m nuitka "$@" install.py
 status=$?
 
 if [ $status -eq 0 ]; then
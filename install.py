@@ -1,25 +1,24 @@
+import atexit
+import contextlib
+import json
+import queue
+import re
 import shutil
+import signal
+import tempfile
 import subprocess
-import inquirer
+import threading
+import time
+from collections import deque
 import os
 import sys
 import platform
-from typing import Optional, Tuple
-
-# GUI imports - only import if needed
-GUI_AVAILABLE = False
-try:
-    from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                                   QWidget, QLabel, QComboBox, QPushButton, QLineEdit, 
-                                   QTextEdit, QProgressBar, QCheckBox, QMessageBox,
-                                   QStackedWidget, QScrollArea)
-    from PySide6.QtCore import QThread, Signal, Qt
-    from PySide6.QtGui import QFont, QPalette, QColor
-    GUI_AVAILABLE = True
-except ImportError:
-    pass
-
-import datetime
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Modules only needed by discovery, index access or the wheel backend
+# (concurrent.futures, http.client, ssl, urllib, zipfile, hashlib, csv) are
+# imported where they are used to keep console and silent startup close to a
+# bare interpreter.
 
 # Fun color codes
 RED = "\033[91m"
@@ -27,7 +26,6 @@ GREEN = "\033[92m"
 YELLOW = "\033[93m"
 CYAN = "\033[96m"
 RESET = "\033[0m"
-YEAR = datetime.datetime.now().year
 
 # Detect platform and adjust python candidates
 system = platform.system()
@@ -37,654 +35,2495 @@ elif system == "Darwin":
     python_names = ["python3", "python"]
 else:  # Assume Linux/Unix
     python_names = ["python3", "python"]
+# Versioned names pick up side-by-side installs (distro, pyenv, deadsnakes)
+python_names += [f"python3.{minor}" for minor in range(14, 5, -1)]
+
+DISCOVERY_WORKERS = 8
+BATCH_JOBS = 4  # interpreters installed into at once in batch mode
+PROBE_TIMEOUT = 10.0
+INTERPRETER_CACHE_LIMIT = 64
+# Interpreters that failed to run (e.g. pyenv shims for missing versions) are
+# remembered for a short while only
+INTERPRETER_FAILURE_TTL = 600
+
+def user_cache_dir() -> str:
+    """Per-user cache directory for the installer (CLYPINSTALLER_CACHE_DIR overrides)."""
+    override = os.environ.get("CLYPINSTALLER_CACHE_DIR")
+    if override:
+        return override
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, "clypinstaller", "Cache")
+    if system == "Darwin":
+        return os.path.expanduser("~/Library/Caches/clypinstaller")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "clypinstaller")
+
+@contextlib.contextmanager
+def file_lock(path: str, blocking: bool = True, shared: bool = False) -> Iterator[bool]:
+    """Hold an exclusive (or shared) lock on path (created if missing) across processes.
 
-python_candidates = []
-for name in python_names:
-    path = shutil.which(name)
-    if path:
+    Yields True once the lock is held. With blocking=False, yields False
+    straight away when another process holds a conflicting lock. Windows has
+    no shared locks, so a shared lock is not taken there.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if shared and system == "Windows":
+        yield True
+        return
+    with open(path, "a+b") as f:
         try:
-            version = subprocess.check_output(
-                [path, "--version"], stderr=subprocess.STDOUT
-            )
-            version = version.decode().strip()
-            python_candidates.append(f"{CYAN}{version}{RESET} ({YELLOW}{path}{RESET})")
-        except Exception:
-            pass
+            if system == "Windows":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+                fcntl.flock(f.fileno(), mode | (0 if blocking else fcntl.LOCK_NB))
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if system == "Windows":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
-def check_pip_exists(python_path):
-    """Check if pip is available for the given python executable."""
+def _replace_from_temp(path: str, write: Callable[[str], None]) -> None:
+    """Write a file through a unique temp file in its directory and move it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    os.close(fd)
     try:
-        result = subprocess.run(
-            [python_path, "-m", "pip", "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+class RunReport:
+    """Timing spans, subprocess runs and counters for --report.
 
-def offer_pip_install(python_path):
-    print(f"{YELLOW}pip is not installed for {python_path}.{RESET}")
-    print(f"{CYAN}Attempting to install pip using ensurepip...{RESET}")
+    Nothing is recorded until enabled is set, so the instrumentation is free
+    on normal runs. Spans and commands may be added from any thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.time()
+        self._origin = time.monotonic()
+        self.spans: List[Dict[str, Any]] = []
+        self.commands: List[Dict[str, Any]] = []
+        self.counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _offset(self, moment: float) -> float:
+        return round(moment - self._origin, 4)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs):
+        """Time the with-block; the yielded dict can be updated with results."""
+        started = time.monotonic()
+        try:
+            yield attrs
+        finally:
+            if self.enabled:
+                entry = {"name": name, "start": self._offset(started),
+                         "duration": round(time.monotonic() - started, 4),
+                         "thread": threading.current_thread().name}
+                entry.update(attrs)
+                with self._lock:
+                    self.spans.append(entry)
+
+    def command(self, argv: List[str], returncode: int, output_bytes: int, started: float) -> None:
+        if self.enabled:
+            entry = {"argv": [str(arg) for arg in argv], "returncode": returncode,
+                     "output_bytes": output_bytes, "start": self._offset(started),
+                     "duration": round(time.monotonic() - started, 4)}
+            with self._lock:
+                self.commands.append(entry)
+
+    def count(self, name: str) -> None:
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + 1
+
+    def write(self, path: str, exit_code: int) -> None:
+        report = {
+            "argv": sys.argv,
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "started": self.started,
+            "elapsed": self._offset(time.monotonic()),
+            "exit_code": exit_code,
+            "spans": sorted(self.spans, key=lambda span: span["start"]),
+            "commands": self.commands,
+            "counters": self.counters,
+            "download_cache": {"hits": download_cache.hits, "misses": download_cache.misses},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+run_report = RunReport()
+
+# Bump together with "schema" below so cached records of the old shape are ignored
+INTROSPECT_SCHEMA = 5
+
+# Run inside the target interpreter to describe it in a single spawn. Must stay
+# compatible with every Python we support (3.4+), so no f-strings here.
+INTROSPECT_SCRIPT = r"""
+import json, os, platform, re, site, sys, sysconfig
+
+# "-c" puts the installer's working directory first on sys.path; it is not
+# part of the target environment
+if sys.path and sys.path[0] == "":
+    del sys.path[0]
+
+def find_spec(name):
     try:
-        subprocess.check_call([python_path, "-m", "ensurepip", "--upgrade"])
-        print(f"{GREEN}pip installed successfully!{RESET}")
-        return True
+        import importlib.util
+        return importlib.util.find_spec(name) is not None
     except Exception:
-        print(f"{RED}Failed to install pip automatically. Please install pip manually for this Python interpreter.{RESET}")
         return False
 
-def is_venv(python_path):
-    """Detect if the given python executable is inside a venv."""
+def distributions():
+    # name -> version from dist-info (and legacy egg-info) directory names,
+    # first on sys.path wins; "name-1.0-py3.11.egg-info" carries a Python tag
+    found = {}
+    for entry in sys.path:
+        try:
+            names = os.listdir(entry or ".")
+        except OSError:
+            continue
+        for item in names:
+            stem, ext = os.path.splitext(item)
+            if ext in (".dist-info", ".egg-info") and "-" in stem:
+                name, version = stem.split("-")[:2]
+                name = re.sub(r"[-_.]+", "-", name).lower()
+                found.setdefault(name, version)
+    return found
+
+paths = sysconfig.get_paths()
+dists = distributions()
+base_prefix = getattr(sys, "real_prefix", getattr(sys, "base_prefix", sys.prefix))
+print(json.dumps({
+    "schema": 5,
+    "executable": sys.executable,
+    "version": platform.python_version(),
+    "version_info": list(sys.version_info[:3]),
+    "implementation": platform.python_implementation(),
+    "prefix": sys.prefix,
+    "base_prefix": base_prefix,
+    "is_venv": base_prefix != sys.prefix,
+    # PEP 668: the distro manages this interpreter's packages
+    "externally_managed": base_prefix == sys.prefix and os.path.isfile(
+        os.path.join(paths.get("stdlib") or "", "EXTERNALLY-MANAGED")),
+    "pip_available": find_spec("pip"),
+    "pip": dists.get("pip"),
+    "uv_available": find_spec("uv"),
+    "uv": dists.get("uv"),
+    "clyp": dists.get("clyp"),
+    # Also true for develop installs (egg-link, .pth) that leave no metadata here
+    "clyp_importable": find_spec("clyp"),
+    "platform": sysconfig.get_platform(),
+    "sys_platform": sys.platform,
+    "machine": platform.machine(),
+    "soabi": sysconfig.get_config_var("SOABI"),
+    "purelib": paths.get("purelib"),
+    "platlib": paths.get("platlib"),
+    "scripts": paths.get("scripts"),
+    # pip install --user lands here; None when the user site is disabled (venvs)
+    "usersite": site.getusersitepackages() if site.ENABLE_USER_SITE else None,
+    "distributions": dists,
+}))
+"""
+
+def _mtime_ns(path: Optional[str]) -> Optional[int]:
     try:
-        # Run a small Python snippet to check for venv
-        result = subprocess.run(
-            [python_path, "-c", "import sys; print(hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix))"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return result.stdout.strip() == "True"
-    except Exception:
-        return False
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+# Environment variables that change what an interpreter reports about itself
+PROBE_ENV_VARS = ("PYTHONPATH", "PYTHONHOME", "PYTHONUSERBASE", "PYTHONNOUSERSITE",
+                  "PYTHONPLATLIBDIR", "PYTHONSAFEPATH", "PYTHONEXECUTABLE")
+
+def interpreter_fingerprint(python_path: str) -> Optional[Dict[str, Any]]:
+    """Identify the executable behind python_path by resolved path, inode, size and mtime.
+
+    The PROBE_ENV_VARS that are set are included, since they change sys.path.
+    """
+    path = python_path if os.path.dirname(python_path) else (shutil.which(python_path) or python_path)
+    resolved = os.path.realpath(path)
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        return None
+    return {"resolved": resolved, "inode": st.st_ino, "size": st.st_size, "mtime": st.st_mtime_ns,
+            "env": {name: os.environ[name] for name in PROBE_ENV_VARS if name in os.environ}}
+
+def site_mtimes(record: Optional[Dict[str, Any]]) -> Optional[List[Optional[int]]]:
+    """mtimes of the directories packages are installed into: site-packages and the user site."""
+    if record is None:
+        return None
+    return [_mtime_ns(record.get("purelib")), _mtime_ns(record.get("usersite"))]
+
+class InterpreterCache:
+    """On-disk cache of introspection records, shared across installer runs.
+
+    Entries are keyed by the interpreter path as given (venvs often symlink to
+    the same base executable) and are only reused while the executable's
+    fingerprint and the mtimes of its site-packages and user site directories
+    are unchanged, so installing or removing packages, including with
+    pip install --user, invalidates them. Failed probes are kept
+    for INTERPRETER_FAILURE_TTL seconds. The least recently used entries are
+    dropped beyond ``limit``.
+    """
+
+    def __init__(self, path: str, limit: int = INTERPRETER_CACHE_LIMIT):
+        self.path = path
+        self.limit = limit
+        self.enabled = True
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._forgotten = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, python_path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (hit, record) for an interpreter unchanged since it was probed.
+
+        A hit with a None record means the interpreter recently failed to run.
+        """
+        if not self.enabled:
+            return False, None
+        key = os.path.abspath(python_path)
+        with self._lock:
+            entry = self._load().get(key)
+        if not entry:
+            return False, None
+        record = entry.get("record")
+        now = time.time()
+        if record is not None and record.get("schema") != INTROSPECT_SCHEMA:
+            stale = True
+        elif record is None:
+            stale = now - entry.get("last_probed", 0) > INTERPRETER_FAILURE_TTL
+        else:
+            stale = entry.get("site_mtimes") != site_mtimes(record)
+        if stale or entry.get("fingerprint") != interpreter_fingerprint(python_path):
+            self.forget(python_path)
+            return False, None
+        with self._lock:
+            entry["last_used"] = now
+            self._dirty = True
+        return True, record
+
+    def put(self, python_path: str, record: Optional[Dict[str, Any]]):
+        if not self.enabled:
+            return
+        fingerprint = interpreter_fingerprint(python_path)
+        if fingerprint is None:
+            return
+        now = time.time()
+        with self._lock:
+            key = os.path.abspath(python_path)
+            self._forgotten.discard(key)
+            self._load()[key] = {
+                "fingerprint": fingerprint,
+                "site_mtimes": site_mtimes(record),
+                "last_probed": now,
+                "last_used": now,
+                "record": record,
+            }
+            self._dirty = True
+
+    def forget(self, python_path: str):
+        key = os.path.abspath(python_path)
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._forgotten.add(key)
+                self._dirty = True
+
+    def save(self):
+        """Merge with the file on disk, trim to the LRU limit and write atomically."""
+        with self._lock:
+            if not self._dirty or not self.enabled:
+                return
+            # Other installer processes may have written since we loaded
+            merged = self._read()
+            for key in self._forgotten:
+                merged.pop(key, None)
+            for key, entry in self._load().items():
+                if entry.get("last_used", 0) >= merged.get(key, {}).get("last_used", 0):
+                    merged[key] = entry
+            newest = sorted(merged.items(), key=lambda item: item[1].get("last_used", 0), reverse=True)
+            self._entries = dict(newest[:self.limit])
+            try:
+                directory = os.path.dirname(self.path)
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError:
+                pass
+
+interpreter_cache = InterpreterCache(os.path.join(user_cache_dir(), "interpreters.json"))
+atexit.register(interpreter_cache.save)
+
+_introspection_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+_introspection_lock = threading.Lock()
+
+def introspect_python(python_path: str, timeout: Optional[float] = None,
+                      refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Describe an interpreter (version, venv, pip, uv, clyp, paths) in one spawn.
+
+    Records are memoized per path and persisted in interpreter_cache; pass
+    refresh=True after changing the environment. Returns None if the
+    interpreter cannot be run. timeout defaults to python_discovery.timeout
+    (--probe-timeout). Only failures that will repeat (a non-zero exit or
+    unreadable output) are persisted; a timeout is retried on the next run.
+    """
+    if not refresh:
+        with _introspection_lock:
+            if python_path in _introspection_cache:
+                return _introspection_cache[python_path]
+        hit, record = interpreter_cache.get(python_path)
+        if hit:
+            run_report.count("interpreter_cache.hit")
+            with _introspection_lock:
+                _introspection_cache[python_path] = record
+            return record
+        run_report.count("interpreter_cache.miss")
+    with run_report.span("probe", python=python_path, refresh=refresh) as span:
+        persist = True
+        try:
+            output = subprocess.check_output(
+                [python_path, "-c", INTROSPECT_SCRIPT],
+                stderr=subprocess.DEVNULL,
+                timeout=python_discovery.timeout if timeout is None else timeout,
+            )
+            record = json.loads(output.decode())
+        except (subprocess.CalledProcessError, ValueError):
+            record = None
+        except Exception:
+            # Timed out or could not start: possibly a one-off, so keep it out of the cache
+            record = None
+            persist = False
+        span["success"] = record is not None
+    if persist:
+        interpreter_cache.put(python_path, record)
+    else:
+        interpreter_cache.forget(python_path)
+    with _introspection_lock:
+        _introspection_cache[python_path] = record
+    return record
+
+class PythonCandidate(NamedTuple):
+    """A Python interpreter found on PATH."""
+    path: str
+    version: str
+
+    def label(self, color: bool = False) -> str:
+        if color:
+            return f"{CYAN}{self.version}{RESET} ({YELLOW}{self.path}{RESET})"
+        return f"{self.version} ({self.path})"
+
+class InterpreterDiscovery:
+    """Lazily locate Python interpreters on PATH.
+
+    Nothing is looked up or spawned until candidates() is first called, and the
+    result is memoized for the rest of the process.
+    """
+
+    def __init__(self, names: Optional[List[str]] = None,
+                 max_workers: int = DISCOVERY_WORKERS, timeout: float = PROBE_TIMEOUT):
+        self.names = list(names) if names is not None else list(python_names)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._candidates: Optional[List[PythonCandidate]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def probed(self) -> bool:
+        return self._candidates is not None
+
+    def candidates(self, on_found: Optional[Callable[[int, PythonCandidate], None]] = None
+                   ) -> List[PythonCandidate]:
+        """Return the interpreters found on PATH, probing them on first use.
+
+        on_found(position, candidate) is called for each usable interpreter as
+        soon as its probe answers (or straight away when already probed);
+        candidates with a lower position come earlier on PATH.
+        """
+        with self._lock:
+            if self._candidates is None:
+                with run_report.span("discovery") as span:
+                    self._candidates = self._probe(on_found)
+                    span["found"] = len(self._candidates)
+            elif on_found:
+                for position, candidate in enumerate(self._candidates):
+                    on_found(position, candidate)
+        return self._candidates
+
+    def first(self) -> Optional[PythonCandidate]:
+        """Auto-select the first usable interpreter."""
+        candidates = self.candidates()
+        return candidates[0] if candidates else None
+
+    def _locate(self) -> List[str]:
+        """Resolve candidate names on PATH, dropping aliases of the same file."""
+        paths = []
+        seen = set()
+        for name in self.names:
+            path = shutil.which(name)
+            if path:
+                real = os.path.realpath(path)
+                if real not in seen:
+                    seen.add(real)
+                    paths.append(path)
+        return paths
+
+    def _probe_one(self, path: str) -> Optional[PythonCandidate]:
+        # The full introspection record is cached, so the install that follows
+        # does not need to spawn this interpreter again.
+        record = introspect_python(path, timeout=self.timeout)
+        if record is None:
+            return None
+        return PythonCandidate(path, f"Python {record['version']}")
+
+    def _probe(self, on_found: Optional[Callable[[int, PythonCandidate], None]] = None
+               ) -> List[PythonCandidate]:
+        """Probe all located interpreters concurrently, preserving PATH order."""
+        paths = self._locate()
+        if not paths:
+            return []
+        workers = max(1, min(self.max_workers, len(paths)))
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        results: List[Optional[PythonCandidate]] = [None] * len(paths)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._probe_one, path): position for position, path in enumerate(paths)}
+            for future in as_completed(futures):
+                position = futures[future]
+                results[position] = future.result()
+                if on_found and results[position]:
+                    on_found(position, results[position])
+        return [candidate for candidate in results if candidate]
+
+python_discovery = InterpreterDiscovery()
+
+def check_pip_exists(python_path):
+    """Check if pip is available for the given python executable."""
+    record = introspect_python(python_path)
+    return bool(record and record["pip_available"])
 
 def uv_exists(python_path):
     """Check if uv is available in the given python environment."""
+    record = introspect_python(python_path)
+    return bool(record and record["uv_available"])
+
+def installed_clyp_version(python_path):
+    """Return the clyp version installed for the given python, if any."""
+    record = introspect_python(python_path)
+    return record["clyp"] if record else None
+
+def clyp_present(python_path) -> bool:
+    """Whether clyp is installed in any form, including egg and develop installs without a version."""
+    record = introspect_python(python_path)
+    return bool(record and (record["clyp"] or record["clyp_importable"]))
+
+OUTPUT_BATCH_LINES = 25
+OUTPUT_BATCH_INTERVAL = 0.2
+OUTPUT_TAIL_LINES = 200
+STEP_TIMEOUT = 900.0  # seconds one installer command may run before it is killed
+KILL_GRACE = 3.0  # seconds between asking a process tree to stop and killing it
+
+class InstallCancelled(Exception):
+    """The run was cancelled (Cancel button, Ctrl+C) or ran past its overall deadline."""
+
+class CancelToken:
+    """Cancellation flag shared by everything working on one run.
+
+    run_streaming polls it between output batches and kills the running
+    process tree once it trips; the engine and the wheel backend check it
+    between steps. An overall timeout trips it when the deadline passes.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.reason: Optional[str] = None
+
+    def cancel(self, reason: str = "Cancelled by the user.") -> None:
+        if self.reason is None:
+            self.reason = reason
+
+    @property
+    def cancelled(self) -> bool:
+        if self.reason is None and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.reason = "The overall timeout expired."
+        return self.reason is not None
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise InstallCancelled(self.reason)
+
+def cancel_on_sigint(token: CancelToken) -> None:
+    """Make the first Ctrl+C cancel the run cleanly; a second one interrupts at once."""
+    def handler(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        token.cancel("Interrupted.")
+
     try:
-        result = subprocess.run(
-            [python_path, "-m", "uv", "--version"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        return result.returncode == 0
-    except Exception:
+        signal.signal(signal.SIGINT, handler)
+    except ValueError:
+        pass  # not the main thread
+
+def kill_process_tree(process: "subprocess.Popen") -> None:
+    """Stop process and everything it started; it must lead its own process group."""
+    if process.poll() is None and system == "Windows":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elif system != "Windows":
+        # Signal the group even if the leader is gone: its children may not be
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except OSError:
+                break
+            try:
+                process.wait(timeout=KILL_GRACE)
+            except subprocess.TimeoutExpired:
+                pass
+    try:
+        process.wait(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# pip --progress-bar raw prints one of these per downloaded chunk
+_RAW_PROGRESS_RE = re.compile(r"\s*Progress (\d+) of (\d+)\s*$")
+
+def run_streaming(cmd: List[str], on_output: Optional[Callable[[str], None]] = None,
+                  tail_lines: int = OUTPUT_TAIL_LINES, timeout: Optional[float] = None,
+                  cancel: Optional[CancelToken] = None) -> Tuple[int, str]:
+    """Run cmd, forwarding its combined stdout/stderr line by line as it arrives.
+
+    Lines are passed to on_output in batches (at most OUTPUT_BATCH_LINES at a
+    time, or whatever arrived within OUTPUT_BATCH_INTERVAL seconds) so a chatty
+    process does not flood the receiver. Only the last tail_lines lines are
+    kept, for error reporting. pip's raw progress lines are passed on but
+    left out of the tail and the byte count. Returns (returncode, tail).
+
+    The command runs in its own process group. If it outlives timeout the
+    whole tree is killed and a failing returncode is returned; if cancel
+    trips, the tree is killed and InstallCancelled is raised.
+    """
+    started = time.monotonic()
+    output_bytes = 0
+    if system == "Windows":
+        group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group = {"start_new_session": True}
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               stdin=subprocess.DEVNULL, text=True, errors="replace", bufsize=1,
+                               **group)
+    lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    def reader():
+        for line in process.stdout:
+            lines.put(line.rstrip("\r\n"))
+        lines.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    tail: deque = deque(maxlen=tail_lines)
+    pending: List[str] = []
+
+    def flush():
+        if pending and on_output:
+            on_output("\n".join(pending))
+        pending.clear()
+
+    try:
+        while True:
+            if cancel is not None and cancel.cancelled:
+                kill_process_tree(process)
+                raise InstallCancelled(cancel.reason)
+            if timeout and time.monotonic() - started > timeout:
+                kill_process_tree(process)
+                message = f"Timed out after {timeout:.0f}s; stopped {os.path.basename(cmd[0])}."
+                tail.append(message)
+                pending.append(message)
+                break
+            try:
+                line = lines.get(timeout=OUTPUT_BATCH_INTERVAL)
+            except queue.Empty:
+                flush()
+                continue
+            if line is None:
+                break
+            if not _RAW_PROGRESS_RE.match(line):
+                output_bytes += len(line) + 1
+                tail.append(line)
+            pending.append(line)
+            if len(pending) >= OUTPUT_BATCH_LINES:
+                flush()
+    except BaseException:
+        # Including KeyboardInterrupt: the group no longer gets the terminal's Ctrl+C
+        kill_process_tree(process)
+        raise
+    finally:
+        flush()
+        run_report.command(cmd, process.wait(), output_bytes, started)
+    return process.returncode, "\n".join(tail)
+
+def version_tuple(version: Optional[str]) -> Tuple[int, ...]:
+    """Numeric prefix of a version string, e.g. "24.1.2" -> (24, 1, 2)."""
+    parts = []
+    for part in (version or "").split("."):
+        match = re.match(r"\d+", part)
+        if not match:
+            break
+        parts.append(int(match.group()))
+    return tuple(parts)
+
+def pip_progress_args(python_path: str) -> List[str]:
+    """Ask pip for machine-readable download progress when it supports it (24.1+)."""
+    record = introspect_python(python_path)
+    if record and version_tuple(record.get("pip")) >= (24, 1):
+        return ["--progress-bar", "raw"]
+    return []
+
+_SIZE_UNITS = {"b": 1, "bytes": 1, "kb": 1000, "mb": 1000 ** 2, "gb": 1000 ** 3,
+               "kib": 1024, "mib": 1024 ** 2, "gib": 1024 ** 3}
+_SIZE_RE = re.compile(r"\(([\d.]+)\s*([kMG]i?B|B|bytes)\)\s*$", re.IGNORECASE)
+
+class InstallProgressParser:
+    """Derive an overall percentage and ETA from pip or uv output.
+
+    Each phase owns a slice of the bar: resolving 0-10%, downloading 10-75%
+    (weighted by bytes when sizes are known), building 75-85% and installing
+    85-100%. The reported percentage never goes backwards.
+    """
+
+    DOWNLOAD_START = 10
+    BUILD_START = 75
+    INSTALL_START = 85
+
+    def __init__(self):
+        self.percent = 0
+        self.phase = "Starting"
+        self.collected = 0
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.current_total = 0
+        self.current_done = 0
+        self.download_started: Optional[float] = None
+
+    def _set(self, percent: float, phase: str):
+        self.phase = phase
+        self.percent = max(self.percent, min(100, int(percent)))
+
+    def _download_percent(self) -> float:
+        if not self.total_bytes:
+            return self.DOWNLOAD_START
+        fraction = (self.done_bytes + self.current_done) / self.total_bytes
+        return self.DOWNLOAD_START + (self.BUILD_START - self.DOWNLOAD_START) * min(1.0, fraction)
+
+    def eta(self) -> Optional[float]:
+        """Seconds left for the known downloads, from the average rate so far."""
+        if not self.download_started or self.phase != "Downloading":
+            return None
+        received = self.done_bytes + self.current_done
+        elapsed = time.monotonic() - self.download_started
+        if not received or elapsed <= 0:
+            return None
+        return max(0.0, (self.total_bytes - received) / (received / elapsed))
+
+    def status(self) -> str:
+        eta = self.eta()
+        if eta is None or eta < 1:
+            return self.phase
+        return f"{self.phase} - about {int(eta)}s left"
+
+    def feed(self, line: str) -> bool:
+        """Consume one output line; return True if the progress changed."""
+        before = (self.percent, self.phase)
+        text = line.strip()
+        lower = text.lower()
+        raw = _RAW_PROGRESS_RE.match(text)
+        if raw:
+            # pip --progress-bar raw, for the file announced by "Downloading"
+            if self.download_started is None:
+                self.download_started = time.monotonic()
+            self.current_done = int(raw.group(1))
+            total = int(raw.group(2))
+            if total and total != self.current_total:
+                self.total_bytes += total - self.current_total
+                self.current_total = total
+            self._set(self._download_percent(), "Downloading")
+        elif lower.startswith("downloading"):
+            self.done_bytes += self.current_total
+            self.current_total = self.current_done = 0
+            size = _SIZE_RE.search(text)
+            if size:
+                self.current_total = int(float(size.group(1)) * _SIZE_UNITS[size.group(2).lower()])
+                self.total_bytes += self.current_total
+            self._set(self._download_percent(), "Downloading")
+        elif lower.startswith("downloaded"):
+            # uv reports completion per package
+            self.done_bytes += self.current_total
+            self.current_total = self.current_done = 0
+            self._set(self._download_percent(), "Downloading")
+        elif lower.startswith(("collecting", "processing", "using cached", "requirement already satisfied",
+                               "looking in", "obtaining")):
+            self.collected += 1
+            self._set(min(self.DOWNLOAD_START, 2 + 2 * self.collected), "Resolving dependencies")
+        elif lower.startswith("resolved"):
+            self._set(self.DOWNLOAD_START, "Resolving dependencies")
+        elif lower.startswith(("building wheel", "building wheels", "preparing metadata")):
+            self._set(self.BUILD_START, "Building wheels")
+        elif lower.startswith("prepared"):
+            self._set(self.INSTALL_START, "Installing")
+        elif lower.startswith(("installing collected packages", "uninstalling", "found existing installation")):
+            self._set(self.INSTALL_START, "Installing")
+        elif lower.startswith(("successfully installed", "installed ", "successfully uninstalled",
+                               "uninstalled ", "audited ")):
+            self._set(100, "Done")
+        return (self.percent, self.phase) != before
+
+def find_uv(python_path: str) -> Optional[List[str]]:
+    """Command prefix for uv: a standalone binary on PATH, else the target's `-m uv`."""
+    uv_path = shutil.which("uv")
+    if uv_path:
+        return [uv_path]
+    if uv_exists(python_path):
+        return [python_path, "-m", "uv"]
+    return None
+
+def clyp_requirement(clyp_version: Optional[str]) -> str:
+    return f"clyp=={clyp_version}" if clyp_version else "clyp"
+
+PYPI_JSON_URL = "https://pypi.org/pypi"
+HTTP_TIMEOUT = 30
+
+def normalize_name(name: str) -> str:
+    """PEP 503 normalized project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+_PEP440_RE = re.compile(r"""
+    v?(?:(?P<epoch>\d+)!)?(?P<release>\d+(?:\.\d+)*)
+    (?:[-_.]?(?P<pre>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_n>\d+)?)?
+    (?P<post>-(?P<post_implicit>\d+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post_n>\d+)?)?
+    (?P<dev>[-_.]?dev[-_.]?(?P<dev_n>\d+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+""", re.IGNORECASE | re.VERBOSE)
+_PRE_TAGS = {"alpha": "a", "beta": "b", "c": "rc", "pre": "rc", "preview": "rc"}
+
+def version_key(version: Optional[str]) -> Optional[Tuple[Any, ...]]:
+    """Normalized PEP 440 form of a version for equality checks, or None if invalid.
+
+    Trailing ".0" release parts are dropped, so "2.1" and "2.1.0" share a key,
+    while pre-, post- and dev-releases stay distinct from the final release.
+    """
+    match = _PEP440_RE.fullmatch((version or "").strip())
+    if not match:
+        return None
+    release = tuple(int(part) for part in match.group("release").split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    pre = None
+    if match.group("pre"):
+        tag = match.group("pre").lower()
+        pre = (_PRE_TAGS.get(tag, tag), int(match.group("pre_n") or 0))
+    post = None
+    if match.group("post"):
+        post = int(match.group("post_implicit") or match.group("post_n") or 0)
+    dev = int(match.group("dev_n") or 0) if match.group("dev") else None
+    local = tuple(re.split(r"[-_.]", match.group("local").lower())) if match.group("local") else None
+    return (int(match.group("epoch") or 0), release, pre, post, dev, local)
+
+def same_version(version: Optional[str], wanted: Optional[str]) -> bool:
+    """PEP 440 "==wanted" for exact versions: a local label is ignored unless wanted has one."""
+    have, want = version_key(version), version_key(wanted)
+    if have is None or want is None:
         return False
+    if want[5] is None:
+        have = have[:5] + (None,)
+    return have == want
+
+def version_order(version: Optional[str]) -> Tuple[Any, ...]:
+    """PEP 440 sort key: 1.0.dev1 < 1.0a1 < 1.0rc1 < 1.0 < 1.0.post1 < 1.0.1.
+
+    A string that is not a valid version (e.g. "3.13.0+" from a development
+    build of Python) is ordered by its numeric release prefix.
+    """
+    key = version_key(version)
+    if key is None:
+        key = version_key(".".join(map(str, version_tuple(version))))
+        if key is None:
+            return (0,)
+    epoch, release, pre, post, dev, local = key
+    if pre is not None:
+        pre_order: Tuple[Any, ...] = (1, pre)
+    else:
+        pre_order = (0,) if dev is not None and post is None else (2,)
+    post_order = (0,) if post is None else (1, post)
+    dev_order = (1,) if dev is None else (0, dev)
+    local_order: Tuple[Any, ...] = (0,)
+    if local is not None:
+        local_order = (1, tuple((1, int(part), "") if part.isdigit() else (0, 0, part) for part in local))
+    return (1, epoch, release, pre_order, post_order, dev_order, local_order)
+
+def version_satisfies(version: str, specifier: str) -> bool:
+    """Check a version against a PEP 440 specifier like ">=1.0,!=1.3.*".
+
+    Versions are ordered with version_order, so 1.0rc1 does not satisfy
+    ">=1.0". As in PEP 440, "<V" excludes pre-releases of V and ">V"
+    excludes its post-releases, unless V is one itself.
+    """
+    have = version_order(version)
+    have_key = version_key(version)
+    for clause in filter(None, (part.strip() for part in specifier.split(","))):
+        match = re.match(r"(~=|===|==|!=|<=|>=|<|>)\s*(.+)$", clause)
+        if not match:
+            return False
+        op, wanted = match.groups()
+        wanted = wanted.strip()
+        if op == "===":
+            if version.strip().lower() != wanted.lower():
+                return False
+            continue
+        if wanted.endswith(".*"):
+            prefix = version_tuple(wanted[:-2])
+            release = version_tuple(version)
+            release += (0,) * (len(prefix) - len(release))
+            if (op == "==") != (release[:len(prefix)] == prefix):
+                return False
+            continue
+        want = version_order(wanted)
+        want_key = version_key(wanted)
+        if op == "==":
+            ok = same_version(version, wanted)
+        elif op == "!=":
+            ok = not same_version(version, wanted)
+        elif op == "~=":
+            prefix = version_tuple(wanted)[:-1]
+            release = version_tuple(version)
+            release += (0,) * (len(prefix) - len(release))
+            ok = have >= want and release[:len(prefix)] == prefix
+        else:
+            ok = {"<=": have <= want, ">=": have >= want, "<": have < want, ">": have > want}[op]
+            if ok and op in ("<", ">") and have_key and want_key and have_key[:2] == want_key[:2]:
+                epoch, release, pre, post, dev, local = have_key
+                if op == "<" and want_key[2] is None and want_key[4] is None:
+                    ok = pre is None and dev is None
+                elif op == ">" and want_key[3] is None:
+                    ok = post is None
+        if not ok:
+            return False
+    return True
+
+class HttpResult(NamedTuple):
+    status: int
+    body: bytes
+    content_type: Optional[str]
+    from_cache: bool  # True when the server answered 304 and the stored body was used
+
+class HttpClient:
+    """Minimal HTTP/1.1 client for index metadata and wheel downloads.
+
+    Connections are kept alive and reused per (scheme, host, port), so
+    repeated lookups skip the TCP and TLS handshakes. get() stores bodies
+    that carry an ETag or Last-Modified under cache_dir and revalidates them
+    with If-None-Match/If-Modified-Since, so an unchanged resource costs a
+    304. Proxies come from the environment like urllib's; file:// URLs (a
+    local stand-in index) are read through urllib.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, cache_dir: str, timeout: float = HTTP_TIMEOUT, max_idle: int = 4):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, str, int], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def _proxy(self, scheme: str, host: str) -> Optional[Any]:
+        import urllib.parse
+        import urllib.request
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    def _connect(self, scheme: str, host: str, port: int):
+        import http.client
+        proxy = self._proxy(scheme, host)
+        target = (proxy.hostname, proxy.port or 80) if proxy else (host, port)
+        if scheme == "https":
+            import ssl
+            conn = http.client.HTTPSConnection(*target, timeout=self.timeout,
+                                               context=ssl.create_default_context())
+            if proxy:
+                headers = {}
+                if proxy.username:
+                    import base64
+                    import urllib.parse
+                    credentials = (f"{urllib.parse.unquote(proxy.username)}:"
+                                   f"{urllib.parse.unquote(proxy.password or '')}")
+                    headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+                conn.set_tunnel(host, port, headers=headers)
+        else:
+            conn = http.client.HTTPConnection(*target, timeout=self.timeout)
+        return conn
+
+    def _request(self, url: str, headers: Dict[str, str]):
+        """Send a GET on a pooled connection; return (key, connection, response)."""
+        import urllib.parse
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if scheme == "http" and self._proxy(scheme, parts.hostname):
+            target = url  # plain-HTTP proxies take the absolute URL
+        headers = dict(headers, **{"Accept-Encoding": "identity", "User-Agent": "clypinstaller"})
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                conn = idle.pop() if idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(scheme, parts.hostname, port)
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+            except ConnectionError:
+                conn.close()
+                if reused:
+                    continue  # the server dropped an idle keep-alive connection; retry on a new one
+                raise
+            run_report.count("http.reused" if reused else "http.connect")
+            return key, conn, response
+
+    def _release(self, key, conn, response) -> None:
+        """Return the connection to the pool if its response was read completely."""
+        if response.isclosed() and not response.will_close:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    @contextlib.contextmanager
+    def open(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Yield the response for url, following redirects, for streaming reads."""
+        if url.startswith("file:"):
+            import urllib.request
+            with urllib.request.urlopen(url) as response:
+                yield response
+            return
+        import urllib.parse
+        for _ in range(self.MAX_REDIRECTS + 1):
+            key, conn, response = self._request(url, headers or {})
+            if response.status in (301, 302, 303, 307, 308) and response.getheader("Location"):
+                response.read()
+                self._release(key, conn, response)
+                url = urllib.parse.urljoin(url, response.getheader("Location"))
+                continue
+            try:
+                yield response
+            finally:
+                self._release(key, conn, response)
+            return
+        raise OSError(f"too many redirects for {url}")
+
+    def _cache_paths(self, url: str) -> Tuple[str, str]:
+        import hashlib
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return (os.path.join(self.cache_dir, digest + ".json"),
+                os.path.join(self.cache_dir, digest + ".body"))
+
+    def get(self, url: str, cache: bool = True) -> HttpResult:
+        """Fetch url into memory; raise OSError unless the outcome is a 200 or a revalidated 304."""
+        meta_path, body_path = self._cache_paths(url)
+        cached = None
+        if cache:
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+            except (OSError, ValueError):
+                pass
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        with run_report.span("http", url=url) as span, self.open(url, headers) as response:
+            body = response.read()
+            status = getattr(response, "status", None) or 200
+            span["status"] = status
+            span["bytes"] = len(body)
+            if status == 304 and cached:
+                try:
+                    with open(body_path, "rb") as f:
+                        return HttpResult(200, f.read(), cached.get("content_type"), True)
+                except OSError:
+                    pass  # body evicted behind our back; fetch it again below
+            elif status != 200:
+                raise OSError(f"HTTP {status} for {url}")
+            else:
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+                content_type = response.headers.get("Content-Type")
+                if cache and (etag or last_modified):
+                    self._store(meta_path, body_path, body, {
+                        "url": url, "etag": etag, "last_modified": last_modified,
+                        "content_type": content_type, "stored": time.time()})
+                return HttpResult(status, body, content_type, False)
+        return self.get(url, cache=False)
+
+    def _store(self, meta_path: str, body_path: str, body: bytes, meta: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(body_path + suffix, "wb") as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+            with open(meta_path + suffix, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError:
+            pass
+
+http_client = HttpClient(os.path.join(user_cache_dir(), "http"))
+
+CATALOG_TTL = 3600
+
+def metadata_url() -> str:
+    """Base URL of the PyPI-style JSON API for release metadata (CLYPINSTALLER_METADATA_URL overrides)."""
+    return os.environ.get("CLYPINSTALLER_METADATA_URL") or PYPI_JSON_URL
+
+def _trim_file(file: Dict[str, Any]) -> Dict[str, Any]:
+    keys = ("filename", "url", "digests", "requires_python", "yanked", "packagetype")
+    return {key: file[key] for key in keys if key in file}
+
+class VersionCatalog:
+    """The clyp releases on the index, fetched once and cached on disk.
+
+    The cached catalog is used as-is for ttl seconds and then refetched
+    through http_client, which revalidates it so an unchanged index answers
+    with a 304. When the index is unreachable, a stale catalog is still
+    served. base_url is a PyPI-style JSON API; a file:// tree with clyp/json
+    works as a local stand-in.
+    """
+
+    def __init__(self, path: str, base_url: str = PYPI_JSON_URL, ttl: float = CATALOG_TTL):
+        self.path = path
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self._entry: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/clyp/json"
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != self.url or "project" not in entry:
+            return None
+        return entry
+
+    def _save(self, entry: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def _fetch(self) -> Dict[str, Any]:
+        with run_report.span("index", url=self.url) as span:
+            response = http_client.get(self.url)
+            span["not_modified"] = response.from_cache
+            data = json.loads(response.body.decode("utf-8"))
+        project = {
+            "info": {"version": data["info"]["version"]},
+            "urls": [_trim_file(file) for file in data.get("urls", [])],
+            "releases": {version: [_trim_file(file) for file in files]
+                         for version, files in data.get("releases", {}).items()},
+        }
+        entry = {"url": self.url, "checked": time.time(), "project": project}
+        self._save(entry)
+        return entry
+
+    def project(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Project metadata (latest version and every release's files), or None if unknown."""
+        with self._lock:
+            entry = self._entry or self._load()
+            if entry and not refresh and time.time() - entry.get("checked", 0) < self.ttl:
+                self._entry = entry
+                return entry["project"]
+            try:
+                entry = self._fetch()
+            except Exception:
+                pass  # keep serving the stale catalog, if there is one
+            self._entry = entry
+            return entry["project"] if entry else None
+
+    def versions(self) -> List[str]:
+        """Installable releases (not yanked, with files), newest first."""
+        project = self.project() or {}
+        found = [version for version, files in project.get("releases", {}).items()
+                 if files and not all(file.get("yanked") for file in files)]
+        return sorted(found, key=version_order, reverse=True)
+
+    def latest(self) -> Optional[str]:
+        project = self.project()
+        return project["info"]["version"] if project else None
+
+    def release(self, clyp_version: str) -> Optional[str]:
+        """The release equal to clyp_version (so "2.1" finds "2.1.0"), revalidating once if absent.
+
+        Versions are compared in full PEP 440 form: "1.0rc1" never finds "1.0".
+        """
+        if version_key(clyp_version) is None:
+            return None
+        for refresh in (False, True):
+            project = self.project(refresh=refresh)
+            if project is None:
+                return None
+            for release, files in project.get("releases", {}).items():
+                if files and same_version(release, clyp_version):
+                    return release
+        return None
+
+    def files(self, clyp_version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Files of the requested release (the latest one by default)."""
+        project = self.project() or {}
+        if not clyp_version:
+            return project.get("urls", [])
+        release = self.release(clyp_version)
+        return (self.project() or {}).get("releases", {}).get(release, []) if release else []
+
+    def check(self, clyp_version: str) -> Optional[str]:
+        """A message explaining why clyp_version cannot be installed, or None.
+
+        Returns None for a valid version when the catalog is unavailable:
+        nothing can be said then.
+        """
+        if version_key(clyp_version) is None:
+            return f"{clyp_version!r} is not a valid version number."
+        if self.project() is None or self.release(clyp_version):
+            return None
+        recent = ", ".join(self.versions()[:5])
+        return f"Clyp {clyp_version} is not available on the package index. Recent versions: {recent}"
+
+version_catalog = VersionCatalog(os.path.join(user_cache_dir(), "catalog.json"), metadata_url())
+
+def latest_clyp_version() -> Optional[str]:
+    """Latest clyp release on the index, from the version catalog.
+
+    Returns None when the index cannot be reached and nothing usable is cached.
+    """
+    return version_catalog.latest()
+
+def parse_wheel_filename(filename: str) -> Optional[Tuple[str, str, str]]:
+    """(normalized name, version, tag) from a wheel filename, or None."""
+    if not filename.endswith(".whl"):
+        return None
+    parts = filename[:-len(".whl")].split("-")
+    if len(parts) not in (5, 6):
+        return None
+    return normalize_name(parts[0]), parts[1], "-".join(parts[-3:])
+
+def is_pure_wheel(filename: str) -> bool:
+    return filename.endswith(("-py3-none-any.whl", "-py2.py3-none-any.whl"))
+
+class Wheelhouse:
+    """Content-addressed local store of wheels for offline and repeat installs.
+
+    Each wheel is stored once as objects/<sha256[:2]>/<sha256>. The wheels/
+    directory exposes them under their real filenames (hard links where the
+    filesystem allows, copies otherwise) so pip and uv can use it directly
+    with --find-links. index.json maps filenames to digests.
+
+    A pinned wheelhouse is a read-only wheel set shipped with the installer:
+    its newest clyp is the version to install when none is requested.
+    """
+
+    def __init__(self, root: str, pinned: bool = False):
+        self.root = os.path.abspath(root)
+        self.pinned = pinned
+        self.links_dir = os.path.join(self.root, "wheels")
+        self.index_path = os.path.join(self.root, "index.json")
+        self._lock = threading.Lock()
+        self._damaged: Optional[List[str]] = None
+
+    def _read_index(self) -> Dict[str, str]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def add(self, path: str) -> str:
+        """Store a wheel file (idempotently) and return its sha256."""
+        import hashlib
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+        filename = os.path.basename(path)
+
+        def link(tmp_path: str):
+            os.remove(tmp_path)
+            try:
+                os.link(stored, tmp_path)
+            except OSError:
+                shutil.copyfile(stored, tmp_path)
+
+        def write_index(tmp_path: str):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=1, sort_keys=True)
+
+        # Batch and manifest runs in other processes may share this wheelhouse
+        with self._lock, file_lock(os.path.join(self.root, ".lock")):
+            self._damaged = None
+            stored = self.object_path(sha256)
+            if not os.path.exists(stored):
+                os.makedirs(os.path.dirname(stored), exist_ok=True)
+                _replace_from_temp(stored, lambda tmp_path: shutil.copyfile(path, tmp_path))
+            os.makedirs(self.links_dir, exist_ok=True)
+            _replace_from_temp(os.path.join(self.links_dir, filename), link)
+            index = self._read_index()
+            index[filename] = sha256
+            _replace_from_temp(self.index_path, write_index)
+        return sha256
+
+    def wheels(self, name: str) -> List[Tuple[str, str]]:
+        """(version, path) of the stored wheels for a project, newest first."""
+        found = []
+        for filename in self._read_index():
+            parsed = parse_wheel_filename(filename)
+            path = os.path.join(self.links_dir, filename)
+            if parsed and parsed[0] == normalize_name(name) and os.path.exists(path):
+                found.append((parsed[1], path))
+        return sorted(found, key=lambda item: version_order(item[0]), reverse=True)
+
+    def find_pure(self, name: str, version: Optional[str] = None) -> Optional[str]:
+        """Path of a stored pure-Python wheel for name (newest, or a given version)."""
+        for wheel_version, path in self.wheels(name):
+            if not is_pure_wheel(path):
+                continue
+            if version is None or same_version(wheel_version, version):
+                return path
+        return None
+
+    def latest(self, name: str) -> Optional[str]:
+        wheels = self.wheels(name)
+        return wheels[0][0] if wheels else None
+
+    def source_args(self, offline: bool, uv: bool = False) -> List[str]:
+        """pip/uv arguments that make the wheelhouse a package source (the only one if offline)."""
+        args = ["--find-links", self.links_dir]
+        if offline:
+            args.append("--no-index")
+            if uv:
+                args.append("--offline")
+        return args
+
+    def verify(self) -> List[str]:
+        """Filenames whose wheel is missing or no longer matches its digest.
+
+        The files pip and uv read (wheels/) are hashed, once per process:
+        add() discards the result.
+        """
+        with self._lock:
+            if self._damaged is not None:
+                return self._damaged
+        import hashlib
+        bad = []
+        for filename, sha256 in self._read_index().items():
+            digest = hashlib.sha256()
+            try:
+                with open(os.path.join(self.links_dir, filename), "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 16), b""):
+                        digest.update(chunk)
+                ok = digest.hexdigest() == sha256
+            except OSError:
+                ok = False
+            if not ok:
+                bad.append(filename)
+        with self._lock:
+            self._damaged = bad
+        return bad
+
+def default_wheelhouse_dir() -> str:
+    return os.path.join(user_cache_dir(), "wheelhouse")
+
+BUNDLED_WHEELS_DIR = "bundled_wheels"
+
+def bundled_wheelhouse() -> Optional[Wheelhouse]:
+    """The wheel set embedded in the executable by build.sh --bundle-wheels, if any.
+
+    Nuitka places it next to the compiled module (the onefile extraction
+    directory), so it is used in place rather than copied.
+    """
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), BUNDLED_WHEELS_DIR)
+    if not os.path.isfile(os.path.join(root, "index.json")):
+        return None
+    return Wheelhouse(root, pinned=True)
+
+DOWNLOAD_CACHE_LIMIT = 2048  # MB; older entries are evicted past this
+# pip fetches a wheel's .metadata before the wheel itself: count each package once
+_CACHE_HIT_RE = re.compile(r"^\s*Using cached (?!\S+\.metadata\b)")
+_CACHE_MISS_RE = re.compile(r"^\s*Downloading (?!\S+\.metadata\b)")
+
+class DownloadCache:
+    """One download cache for pip and uv, shared by every interpreter and run.
+
+    pip gets <root>/pip through --cache-dir and uv gets <root>/uv. Hits and
+    misses are counted from pip's "Using cached"/"Downloading" lines (uv only
+    reports downloads) and from wheel backend lookups in the wheelhouse.
+
+    A run that uses the cache holds a shared lock on <root>/.lock until it
+    evicts at exit; eviction needs the lock exclusively and is skipped while
+    another run holds it.
+    """
+
+    def __init__(self, root: str, max_mb: int = DOWNLOAD_CACHE_LIMIT):
+        self.root = root
+        self.max_mb = max_mb
+        self.hits = 0
+        self.misses = 0
+        # Set once a command has been pointed at the cache; only then is eviction worth a scan
+        self.used = False
+        self._lock = threading.Lock()
+        self._hold: Optional[contextlib.ExitStack] = None
+
+    @property
+    def lock_path(self) -> str:
+        return os.path.join(self.root, ".lock")
+
+    def _use(self) -> None:
+        with self._lock:
+            self.used = True
+            if self._hold is None:
+                hold = contextlib.ExitStack()
+                hold.enter_context(file_lock(self.lock_path, shared=True))
+                self._hold = hold
+
+    def pip_args(self) -> List[str]:
+        self._use()
+        return ["--cache-dir", os.path.join(self.root, "pip")]
+
+    def uv_args(self) -> List[str]:
+        self._use()
+        return ["--cache-dir", os.path.join(self.root, "uv")]
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def observe(self, line: str) -> None:
+        """Count a cache hit or miss from one line of pip or uv output."""
+        if _CACHE_HIT_RE.match(line):
+            self.record(True)
+        elif _CACHE_MISS_RE.match(line):
+            self.record(False)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of the evictable units, oldest first.
+
+        pip's cache entries are independent files; uv's cache has internal
+        links between its buckets, so it is only ever evicted as a whole.
+        """
+        entries = []
+        for dirpath, _, filenames in os.walk(os.path.join(self.root, "pip")):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        uv_root = os.path.join(self.root, "uv")
+        newest, total = 0.0, 0
+        for dirpath, _, filenames in os.walk(uv_root):
+            for filename in filenames:
+                try:
+                    st = os.lstat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                newest = max(newest, st.st_mtime)
+                total += st.st_size
+        if total:
+            entries.append((newest, total, uv_root))
+        return sorted(entries)
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Delete the oldest entries until the cache fits max_mb; return bytes freed.
+
+        Nothing is deleted while another run is using the cache.
+        """
+        if not self.used:
+            return 0
+        with self._lock:
+            if self._hold is not None:
+                self._hold.close()
+                self._hold = None
+        with file_lock(self.lock_path, blocking=False) as locked:
+            return self._evict() if locked else 0
+
+    def _evict(self) -> int:
+        entries = self._entries()
+        excess = sum(size for _, size, _ in entries) - self.max_mb * 1024 * 1024
+        freed = 0
+        for _, size, path in entries:
+            if freed >= excess:
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            freed += size
+        return freed
+
+    def active(self) -> bool:
+        """Whether this run used the cache at all (and so has something to report)."""
+        return self.used or bool(self.hits or self.misses)
+
+    def summary(self) -> str:
+        return (f"Download cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.size() / (1024 * 1024):.1f} MB in {self.root}")
+
+download_cache = DownloadCache(os.path.join(user_cache_dir(), "downloads"))
+atexit.register(download_cache.evict)
+
+def prefetch_wheels(python_path: str, clyp_version: Optional[str], wheelhouse: Wheelhouse,
+                    on_output: Callable[[str], None] = print,
+                    cancel: Optional[CancelToken] = None) -> Tuple[bool, int]:
+    """Download clyp and its dependencies as wheels for python_path into the wheelhouse.
+
+    Uses the target's pip so platform-specific wheels match that interpreter.
+    Returns (success, number of wheels stored).
+    """
+    if not PipBackend(python_path).prepare(on_output):
+        return False, 0
+    os.makedirs(wheelhouse.links_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as download_dir:
+        cmd = ([python_path, "-m", "pip", "download", "--only-binary=:all:", "--dest", download_dir,
+                clyp_requirement(clyp_version)] + wheelhouse.source_args(offline=False)
+               + download_cache.pip_args())
+        returncode, output = run_streaming(cmd, on_output, cancel=cancel)
+        if returncode != 0:
+            return False, 0
+        stored = 0
+        for filename in os.listdir(download_dir):
+            if filename.endswith(".whl"):
+                wheelhouse.add(os.path.join(download_dir, filename))
+                stored += 1
+    return True, stored
+
+class BackendResult(NamedTuple):
+    """Outcome of one backend operation."""
+    backend: str
+    operation: str
+    success: bool
+    output: str
+    elapsed: float
+
+class BackendSkipped(Exception):
+    """A backend cannot handle this request; the next backend should be tried."""
+
+# Called as hook(result) after every backend operation, e.g. to collect benchmarks
+backend_hooks: List[Callable[[BackendResult], None]] = []
+
+class InstallerBackend:
+    """A way of installing clyp into a given interpreter.
+
+    Subclasses provide the commands; this class runs them through ``runner``
+    (run_streaming by default, InstallWorker.stream in the GUI), times each
+    operation, and reports it to backend_hooks.
+    """
+
+    name = ""
+
+    def __init__(self, python_path: str,
+                 runner: Optional[Callable[[List[str]], Tuple[int, str]]] = None,
+                 deep_verify: bool = False, wheelhouse: Optional[Wheelhouse] = None,
+                 offline: bool = False, cancel: Optional[CancelToken] = None):
+        self.python_path = python_path
+        self.runner = runner or run_streaming
+        self.deep_verify = deep_verify
+        self.wheelhouse = wheelhouse
+        self.offline = offline
+        self.cancel = cancel
+        self.timings: Dict[str, float] = {}
+
+    def source_args(self, uv: bool = False) -> List[str]:
+        return self.wheelhouse.source_args(self.offline, uv=uv) if self.wheelhouse else []
+
+    def available(self) -> bool:
+        return True
+
+    def describe(self) -> str:
+        return self.name
+
+    def prepare(self, on_output: Callable[[str], None]) -> bool:
+        """Get the backend ready to run; return False if it cannot be used."""
+        return True
+
+    def install_command(self, clyp_version: Optional[str]) -> List[str]:
+        raise NotImplementedError
+
+    def uninstall_command(self) -> List[str]:
+        raise NotImplementedError
+
+    def verify(self, clyp_version: Optional[str] = None) -> bool:
+        """Check the installed clyp against the (refreshed) introspection record.
+
+        This reads dist-info metadata only. With deep_verify, clyp is also
+        imported in the target, which runs its package init.
+        """
+        with run_report.span("verify", python=self.python_path, deep=self.deep_verify) as span:
+            installed = installed_clyp_version(self.python_path)
+            span["success"] = bool(installed) and (
+                not clyp_version or same_version(installed, clyp_version))
+            if span["success"] and self.deep_verify:
+                returncode, _ = self.runner([self.python_path, "-c", "import clyp"])
+                span["success"] = returncode == 0
+            return span["success"]
+
+    def _finish(self, operation: str, success: bool, output: str, started: float) -> BackendResult:
+        elapsed = time.monotonic() - started
+        self.timings[operation] = elapsed
+        result = BackendResult(self.name, operation, success, output, elapsed)
+        for hook in backend_hooks:
+            hook(result)
+        return result
+
+    def install(self, clyp_version: Optional[str] = None) -> BackendResult:
+        started = time.monotonic()
+        returncode, output = self.runner(self.install_command(clyp_version))
+        introspect_python(self.python_path, refresh=True)
+        success = returncode == 0 and self.verify(clyp_version)
+        return self._finish("install", success, output, started)
+
+    def uninstall(self) -> BackendResult:
+        started = time.monotonic()
+        returncode, output = self.runner(self.uninstall_command())
+        introspect_python(self.python_path, refresh=True)
+        # pip exits 0 with "not installed" for copies it has no metadata for
+        return self._finish("uninstall", returncode == 0 and not clyp_present(self.python_path),
+                            output, started)
+
+class PipBackend(InstallerBackend):
+    """`python -m pip` in the target interpreter."""
+
+    name = "pip"
+
+    def prepare(self, on_output: Callable[[str], None]) -> bool:
+        if check_pip_exists(self.python_path):
+            return True
+        on_output("pip not found. Attempting to install it with ensurepip...")
+        self.runner([self.python_path, "-m", "ensurepip", "--upgrade"])
+        introspect_python(self.python_path, refresh=True)
+        return check_pip_exists(self.python_path)
+
+    def install_command(self, clyp_version: Optional[str]) -> List[str]:
+        return ([self.python_path, "-m", "pip", "install", clyp_requirement(clyp_version)]
+                + self.source_args() + download_cache.pip_args() + pip_progress_args(self.python_path))
+
+    def uninstall_command(self) -> List[str]:
+        return [self.python_path, "-m", "pip", "uninstall", "-y", "clyp"]
+
+class UvBackend(InstallerBackend):
+    """uv's pip interface, pointed at the target with --python."""
+
+    name = "uv"
+
+    def __init__(self, python_path: str,
+                 runner: Optional[Callable[[List[str]], Tuple[int, str]]] = None, **settings):
+        super().__init__(python_path, runner, **settings)
+        self.uv = find_uv(python_path)
+
+    def available(self) -> bool:
+        return self.uv is not None
+
+    def describe(self) -> str:
+        return f"uv ({self.uv[0]})" if self.uv else "uv"
+
+    def install_command(self, clyp_version: Optional[str]) -> List[str]:
+        return (self.uv + ["pip", "install", "--python", self.python_path, clyp_requirement(clyp_version)]
+                + self.source_args(uv=True) + download_cache.uv_args())
+
+    def uninstall_command(self) -> List[str]:
+        return self.uv + ["pip", "uninstall", "--python", self.python_path, "clyp"]
+
+CONSOLE_SCRIPT_TEMPLATE = """#!{executable}
+# -*- coding: utf-8 -*-
+import re
+import sys
+from {module} import {import_name}
+if __name__ == "__main__":
+    sys.argv[0] = re.sub(r"(-script\\.pyw|\\.exe)?$", "", sys.argv[0])
+    sys.exit({call}())
+"""
+
+def _record_hash(data: bytes) -> str:
+    import base64
+    import hashlib
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=")
+    return "sha256=" + digest.decode()
+
+def _parse_headers(text: str) -> List[Tuple[str, str]]:
+    """Key/value pairs from an RFC 822 style header block (WHEEL, METADATA)."""
+    headers = []
+    for line in text.splitlines():
+        if not line.strip():
+            break
+        if ":" in line and not line[0].isspace():
+            key, value = line.split(":", 1)
+            headers.append((key.strip(), value.strip()))
+    return headers
+
+def _writable_dir(path: str) -> bool:
+    """Whether files can be created in path, or in its nearest existing parent."""
+    while path and not os.path.isdir(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return False
+        path = parent
+    return bool(path) and os.access(path, os.W_OK)
+
+class WheelBackend(InstallerBackend):
+    """Unpack a pure-Python clyp wheel straight into site-packages, without pip.
+
+    Only handles the simple case: a py3-none-any wheel whose dependencies are
+    already installed in the target and which fits the target's Python, in an
+    environment that is writable and not externally managed (PEP 668). On
+    Windows, wheels with console scripts are left to pip, which ships the .exe
+    launchers. Everything else, including an OSError while writing or
+    removing files, raises BackendSkipped so uv or pip take over.
+    Uninstalling deletes the files listed in RECORD, whichever tool wrote them.
+    """
+
+    name = "wheel"
+    _download_lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Only for environments it may write to: writable, and not distro-managed (PEP 668)."""
+        record = introspect_python(self.python_path)
+        if not (record and record.get("purelib") and record.get("scripts")):
+            return False
+        if record.get("externally_managed"):
+            return False
+        return _writable_dir(record["purelib"]) and _writable_dir(record["scripts"])
+
+    def install_command(self, clyp_version: Optional[str]) -> List[str]:
+        raise BackendSkipped("the wheel backend does not run a command")
+
+    def uninstall_command(self) -> List[str]:
+        raise BackendSkipped("the wheel backend does not run a command")
+
+    def uninstall(self) -> BackendResult:
+        """Remove the files listed in clyp's RECORD directly, without pip."""
+        started = time.monotonic()
+        record = introspect_python(self.python_path)
+        if not record.get("clyp") and not record.get("clyp_importable"):
+            return self._finish("uninstall", True, "clyp is not installed", started)
+        if not record.get("clyp"):
+            raise BackendSkipped("clyp is importable but has no .dist-info (an egg or develop install)")
+        try:
+            removed = self.remove_installed(record)
+        except OSError as e:
+            raise BackendSkipped(f"could not remove clyp: {e}")
+        finally:
+            introspect_python(self.python_path, refresh=True)
+        # Another copy (an egg further down sys.path, say) is left to pip
+        gone = not clyp_present(self.python_path)
+        return self._finish("uninstall", gone, f"Removed {removed} files", started)
+
+    def find_dist_info(self, record: Dict[str, Any]) -> Optional[str]:
+        for site_dir in dict.fromkeys(filter(None, (record.get("purelib"), record.get("platlib")))):
+            try:
+                entries = os.listdir(site_dir)
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.endswith(".dist-info") and normalize_name(entry.split("-", 1)[0]) == "clyp":
+                    return os.path.join(site_dir, entry)
+        return None
+
+    def remove_installed(self, record: Dict[str, Any]) -> int:
+        """Delete an installed clyp using its RECORD; return the number of files removed.
+
+        Nothing is deleted unless every listed path lies inside the target
+        environment and its directory is writable. Layouts without a dist-info
+        RECORD (eggs, develop installs) raise BackendSkipped so pip can deal
+        with them.
+        """
+        dist_info = self.find_dist_info(record)
+        if dist_info is None:
+            raise BackendSkipped("no clyp .dist-info found in site-packages")
+        site_dir = os.path.dirname(dist_info)
+        try:
+            with open(os.path.join(dist_info, "RECORD"), encoding="utf-8", newline="") as f:
+                import csv
+                rows = list(csv.reader(f))
+        except OSError:
+            raise BackendSkipped("clyp was installed without a RECORD file")
+
+        roots = [os.path.realpath(path) + os.sep
+                 for path in (record.get("prefix"), site_dir, record.get("scripts")) if path]
+        paths = set()
+        for row in rows:
+            if not row or not row[0]:
+                continue
+            path = os.path.normpath(os.path.join(site_dir, row[0]))
+            if not any(os.path.realpath(path).startswith(root) for root in roots):
+                raise BackendSkipped(f"RECORD lists a file outside the environment: {row[0]}")
+            paths.add(path)
+            if os.path.lexists(path) and not _writable_dir(os.path.dirname(path)):
+                raise BackendSkipped(f"cannot remove {row[0]}: directory is not writable")
+            if path.endswith(".py"):
+                # Bytecode compiled on import is not listed in RECORD
+                cache_dir = os.path.join(os.path.dirname(path), "__pycache__")
+                stem = os.path.splitext(os.path.basename(path))[0] + "."
+                try:
+                    paths.update(os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                                 if name.startswith(stem) and name.endswith(".pyc"))
+                except OSError:
+                    pass
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(dist_info, ignore_errors=True)
+
+        # Prune directories left empty, deepest first, never above site-packages
+        stop = {os.path.normpath(site_dir), os.path.normpath(record.get("scripts") or site_dir)}
+        parents = {os.path.dirname(path) for path in paths}
+        for directory in sorted(parents, key=len, reverse=True):
+            while directory not in stop and directory.startswith(os.path.normpath(site_dir)):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        return removed
+
+    def install(self, clyp_version: Optional[str] = None) -> BackendResult:
+        started = time.monotonic()
+        record = introspect_python(self.python_path)
+        # Concurrent batch installs share the wheelhouse: the first one
+        # downloads the wheel, the others then find it there.
+        with self._download_lock:
+            wheel_path = self.local_wheel(clyp_version)
+            downloaded = wheel_path is None
+            if downloaded:
+                wheel_path = self.download_wheel(clyp_version)
+        download_cache.record(hit=not downloaded)
+        try:
+            output = self.install_wheel(wheel_path, record)
+        except OSError as e:
+            # Read-only site-packages, a full disk...: let uv or pip try (pip can use --user)
+            introspect_python(self.python_path, refresh=True)
+            raise BackendSkipped(f"could not write the wheel's files: {e}")
+        finally:
+            if downloaded:
+                shutil.rmtree(os.path.dirname(wheel_path), ignore_errors=True)
+        introspect_python(self.python_path, refresh=True)
+        return self._finish("install", self.verify(clyp_version), output, started)
+
+    def local_wheel(self, clyp_version: Optional[str]) -> Optional[str]:
+        """A matching clyp wheel from the wheelhouse, if there is one."""
+        if not self.wheelhouse:
+            if self.offline:
+                raise BackendSkipped("offline mode needs a wheelhouse")
+            return None
+        if clyp_version or self.offline or self.wheelhouse.pinned:
+            path = self.wheelhouse.find_pure("clyp", clyp_version)
+        else:
+            # "Latest" online: only use the local wheel if it is the latest release
+            latest = latest_clyp_version()
+            path = self.wheelhouse.find_pure("clyp", latest) if latest else None
+        if path is None and self.offline:
+            raise BackendSkipped("no matching clyp wheel in the wheelhouse")
+        return path
+
+    def download_wheel(self, clyp_version: Optional[str]) -> str:
+        """Fetch the pure-Python wheel for the release into a temp file, checking its hash.
+
+        The download is also added to the wheelhouse when one is configured.
+        """
+        if version_catalog.project() is None:
+            raise BackendSkipped("could not query the package index")
+        wheels = [f for f in version_catalog.files(clyp_version) if is_pure_wheel(f["filename"])]
+        if not wheels:
+            raise BackendSkipped("no pure-Python wheel is published for this release")
+        wheel = wheels[0]
+        # Keep the real filename: it is how the wheelhouse and pip identify wheels
+        download_dir = tempfile.mkdtemp()
+        path = os.path.join(download_dir, wheel["filename"])
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            import hashlib
+            digest = hashlib.sha256()
+            with run_report.span("download", url=wheel["url"]), os.fdopen(fd, "wb") as f, \
+                    http_client.open(wheel["url"]) as response:
+                if getattr(response, "status", 200) not in (None, 200):
+                    raise BackendSkipped(f"download failed with HTTP {response.status}")
+                for chunk in iter(lambda: response.read(1 << 16), b""):
+                    if self.cancel is not None:
+                        self.cancel.check()
+                    digest.update(chunk)
+                    f.write(chunk)
+            expected = wheel.get("digests", {}).get("sha256")
+            if expected and digest.hexdigest() != expected:
+                raise BackendSkipped(f"hash mismatch for {wheel['filename']}")
+            if self.wheelhouse and not self.wheelhouse.pinned:
+                self.wheelhouse.add(path)
+        except BaseException:
+            shutil.rmtree(download_dir, ignore_errors=True)
+            raise
+        return path
+
+    def missing_requirements(self, metadata: str, record: Dict[str, Any]) -> List[str]:
+        """Requires-Dist entries not already satisfied in the target.
+
+        Environment markers other than extras are not evaluated, so a
+        conditional dependency counts as required; pip sorts those out.
+        """
+        installed = record.get("distributions") or {}
+        missing = []
+        for key, value in _parse_headers(metadata):
+            if key != "Requires-Dist":
+                continue
+            requirement, _, marker = value.partition(";")
+            if "extra" in marker:
+                continue
+            match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(\[[^\]]*\])?\s*\(?([^()]*)\)?", requirement)
+            if not match:
+                missing.append(value)
+                continue
+            have = installed.get(normalize_name(match.group(1)))
+            if have is None or not version_satisfies(have, match.group(3).strip()):
+                missing.append(requirement.strip())
+        return missing
+
+    def install_wheel(self, wheel_path: str, record: Dict[str, Any]) -> str:
+        """Unpack the wheel and write INSTALLER, REQUESTED, RECORD and console scripts."""
+        site_dir = record["purelib"]
+        scripts_dir = record["scripts"]
+        import csv
+        import io
+        import zipfile
+        with zipfile.ZipFile(wheel_path) as wheel:
+            names = wheel.namelist()
+            dist_info = next((n.split("/")[0] for n in names
+                              if n.count("/") == 1 and n.endswith(".dist-info/WHEEL")), None)
+            if dist_info is None:
+                raise BackendSkipped("wheel has no .dist-info/WHEEL")
+            wheel_info = dict(_parse_headers(wheel.read(f"{dist_info}/WHEEL").decode()))
+            if wheel_info.get("Root-Is-Purelib", "").lower() != "true":
+                raise BackendSkipped("wheel is not pure Python")
+            metadata = wheel.read(f"{dist_info}/METADATA").decode()
+            requires_python = dict(_parse_headers(metadata)).get("Requires-Python", "")
+            if not version_satisfies(record["version"], requires_python):
+                raise BackendSkipped(f"Python {record['version']} does not match {requires_python}")
+            missing = self.missing_requirements(metadata, record)
+            if missing:
+                raise BackendSkipped("dependencies need resolving: " + ", ".join(missing))
+
+            # Plan every destination before touching the target
+            data_dir = dist_info[:-len(".dist-info")] + ".data"
+            plan = []
+            for name in names:
+                if name.endswith("/") or name == f"{dist_info}/RECORD":
+                    continue
+                target_root, relative = site_dir, name
+                if name.startswith(data_dir + "/"):
+                    _, scheme, relative = name.split("/", 2)
+                    if scheme in ("purelib", "platlib"):
+                        target_root = site_dir
+                    elif scheme == "scripts":
+                        target_root = scripts_dir
+                    else:
+                        raise BackendSkipped(f"wheel installs {scheme} files")
+                destination = os.path.realpath(os.path.join(target_root, relative))
+                if not destination.startswith(os.path.realpath(target_root) + os.sep):
+                    raise BackendSkipped(f"unsafe path in wheel: {name}")
+                plan.append((name, destination))
+
+            entry_points = ""
+            if f"{dist_info}/entry_points.txt" in names:
+                entry_points = wheel.read(f"{dist_info}/entry_points.txt").decode()
+            scripts = self.console_scripts(entry_points)
+            if scripts and system == "Windows":
+                raise BackendSkipped("console scripts need pip's .exe launchers on Windows")
+            executable = record["executable"]
+            if scripts and " " in executable:
+                raise BackendSkipped("interpreter path cannot be used in a shebang")
+            if record.get("clyp"):
+                # The wheel is usable, so replacing the existing install is safe now
+                self.remove_installed(record)
+
+            written = []
+            rows = []
+            try:
+                def write(path: str, data: bytes, mode: Optional[int] = None):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    written.append(path)
+                    if mode is not None:
+                        os.chmod(path, mode)
+                    rows.append([os.path.relpath(path, site_dir).replace(os.sep, "/"),
+                                 _record_hash(data), str(len(data))])
+
+                for name, destination in plan:
+                    data = wheel.read(name)
+                    mode = None
+                    if name.startswith(data_dir + "/scripts/"):
+                        if data.startswith(b"#!python"):
+                            data = b"#!" + executable.encode() + data[len(b"#!python"):]
+                        mode = 0o755
+                    write(destination, data, mode)
+                for script, (module, attribute) in scripts.items():
+                    import_name = attribute.split(".")[0]
+                    content = CONSOLE_SCRIPT_TEMPLATE.format(
+                        executable=executable, module=module, import_name=import_name, call=attribute)
+                    write(os.path.join(scripts_dir, script), content.encode(), 0o755)
+                write(os.path.join(site_dir, dist_info, "INSTALLER"), b"clypinstaller\n")
+                write(os.path.join(site_dir, dist_info, "REQUESTED"), b"")
+
+                record_path = os.path.join(site_dir, dist_info, "RECORD")
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator="\n")
+                writer.writerows(rows)
+                writer.writerow([f"{dist_info}/RECORD", "", ""])
+                os.makedirs(os.path.dirname(record_path), exist_ok=True)
+                with open(record_path, "w", encoding="utf-8", newline="") as f:
+                    f.write(buffer.getvalue())
+                written.append(record_path)
+            except BaseException:
+                for path in written:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                raise
+        return f"Unpacked {len(written)} files from {os.path.basename(wheel_path)} into {site_dir}"
+
+    def console_scripts(self, entry_points: str) -> Dict[str, Tuple[str, str]]:
+        """Map script name -> (module, attribute) from entry_points.txt."""
+        scripts = {}
+        section = None
+        for line in entry_points.splitlines():
+            line = line.strip()
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1]
+            elif section in ("console_scripts", "gui_scripts") and "=" in line:
+                script, target = (part.strip() for part in line.split("=", 1))
+                module, _, attribute = target.split("[")[0].strip().partition(":")
+                scripts[script] = (module.strip(), attribute.strip())
+        return scripts
+
+INSTALLER_BACKENDS: Dict[str, type] = {}
+
+def register_backend(backend_class: type) -> type:
+    """Make a backend selectable with --backend and eligible for auto/benchmarking."""
+    INSTALLER_BACKENDS[backend_class.name] = backend_class
+    return backend_class
+
+register_backend(WheelBackend)
+register_backend(UvBackend)
+register_backend(PipBackend)
+
+def backend_order(python_path: str, preference: str = "auto") -> List[str]:
+    """Backend names to try, in order: the preferred one first, the rest as fallbacks.
+
+    For "auto" this is registration order, so faster backends come first.
+    """
+    names = list(INSTALLER_BACKENDS)
+    if preference in INSTALLER_BACKENDS:
+        names.remove(preference)
+        names.insert(0, preference)
+    return names
+
+def create_backends(python_path: str, preference: str = "auto",
+                    runner: Optional[Callable[[List[str]], Tuple[int, str]]] = None,
+                    **settings) -> List[InstallerBackend]:
+    """Instantiate the usable backends for python_path in the order they should be tried.
+
+    settings (deep_verify, wheelhouse, offline, cancel) are passed to every backend.
+    """
+    backends = [INSTALLER_BACKENDS[name](python_path, runner, **settings)
+                for name in backend_order(python_path, preference)]
+    return [backend for backend in backends if backend.available()]
+
+def benchmark_backends(python_path: str, clyp_version: Optional[str] = None,
+                       names: Optional[List[str]] = None, rounds: int = 1,
+                       wheelhouse: Optional[Wheelhouse] = None, offline: bool = False,
+                       step_timeout: Optional[float] = STEP_TIMEOUT,
+                       cancel: Optional[CancelToken] = None) -> List[BackendResult]:
+    """Time a clean install and an uninstall of clyp with each backend in turn.
+
+    Each command is bounded by step_timeout and stops when cancel trips.
+    Whatever clyp the interpreter had before is put back afterwards, even
+    when a run fails or is cancelled.
+    """
+    cancel = cancel or CancelToken()
+    previous = installed_clyp_version(python_path)
+    had_clyp = clyp_present(python_path)
+
+    def runner(cmd: List[str]) -> Tuple[int, str]:
+        return run_streaming(cmd, lambda text: None, timeout=step_timeout, cancel=cancel)
+
+    results = []
+    settings = {"wheelhouse": wheelhouse, "offline": offline, "cancel": cancel}
+    fallback = PipBackend(python_path, runner, **settings)
+    try:
+        for name in names or list(INSTALLER_BACKENDS):
+            backend = INSTALLER_BACKENDS[name](python_path, runner, **settings)
+            if not backend.available() or not backend.prepare(print):
+                continue
+            for _ in range(rounds):
+                cancel.check()
+                try:
+                    if clyp_present(python_path):
+                        backend.uninstall()
+                    results.append(backend.install(clyp_version))
+                    results.append(backend.uninstall())
+                except BackendSkipped as e:
+                    print(f"{YELLOW}{name} skipped: {e}{RESET}")
+                    if clyp_present(python_path):
+                        fallback.uninstall()
+    finally:
+        restore_clyp(python_path, previous if had_clyp else None, wheelhouse, offline, step_timeout)
+    return results
+
+def restore_clyp(python_path: str, version: Optional[str], wheelhouse: Optional[Wheelhouse],
+                 offline: bool, step_timeout: Optional[float]) -> None:
+    """Put an interpreter back to clyp version (or to no clyp) after --benchmark."""
+    current = installed_clyp_version(python_path)
+    if version is None and not clyp_present(python_path):
+        return
+    if version is not None and current and same_version(current, version):
+        return
+    engine = InstallEngine(python_path, version, uninstall=version is None, force=True,
+                           wheelhouse=wheelhouse, offline=offline, step_timeout=step_timeout)
+    print(f"{CYAN}Restoring clyp {version}...{RESET}" if version
+          else f"{CYAN}Removing the clyp installed by the benchmark...{RESET}")
+    success, message = engine.run()
+    print(f"{GREEN if success else RED}{message}{RESET}")
+
+class InstallerOptions:
+    """Options parsed from the command line."""
+
+    def __init__(self):
+        self.python_path: Optional[str] = None
+        self.clyp_version: Optional[str] = None
+        self.uninstall = False
+        self.silent = False
+        self.gui_mode = False
+        self.console = False
+        self.discovery_workers = DISCOVERY_WORKERS
+        self.probe_timeout = PROBE_TIMEOUT
+        self.use_cache = True
+        self.backend = "auto"
+        self.benchmark = False
+        self.probe_only = False
+        self.deep_verify = False
+        self.force = False
+        self.wheelhouse: Optional[str] = None
+        self.offline = False
+        self.prefetch = False
+        self.use_bundled = True
+        self.python_paths: List[str] = []
+        self.all_discovered = False
+        self.jobs = BATCH_JOBS
+        self.cache_dir: Optional[str] = None
+        self.cache_limit = DOWNLOAD_CACHE_LIMIT
+        self.manifest: Optional[str] = None
+        self.report: Optional[str] = None
+        self.timeout: Optional[float] = None
+        self.step_timeout: Optional[float] = STEP_TIMEOUT
+        self.metadata_url: Optional[str] = None
+
+    def is_batch(self) -> bool:
+        return self.all_discovered or len(self.python_paths) > 1
+
+    def get_wheelhouse(self) -> Optional[Wheelhouse]:
+        """The wheelhouse to use: --wheelhouse, the bundled wheels, or the default one.
+
+        --prefetch always writes to a writable wheelhouse, never the bundle.
+        """
+        if self.wheelhouse:
+            return Wheelhouse(self.wheelhouse)
+        if self.prefetch:
+            return Wheelhouse(default_wheelhouse_dir())
+        bundled = bundled_wheelhouse() if self.use_bundled else None
+        if bundled:
+            return bundled
+        if self.offline:
+            return Wheelhouse(default_wheelhouse_dir())
+        return None
+
+def numeric_arg(name: str, value: str, convert: Callable[[str], Any] = int) -> Any:
+    """A non-negative int or float option value; exits with status 2 on anything else."""
+    try:
+        number = convert(value)
+    except ValueError:
+        number = None
+    if number is None or not number >= 0:  # also rejects NaN
+        kind = "whole number" if convert is int else "number"
+        print(f"{RED}Invalid value {value!r} for {name}; expected a non-negative {kind}.{RESET}")
+        sys.exit(2)
+    return number
 
 def parse_args():
     """Parse CLI arguments for python path and clyp version."""
-    python_path = None
-    clyp_version = None
-    uninstall = False
-    silent = False
-    gui_mode = False
+    options = InstallerOptions()
     args = sys.argv[1:]
     i = 0
     while i < len(args):
         arg = args[i]
         if arg in ("--python", "-p") and i + 1 < len(args):
-            python_path = args[i + 1]
+            # Repeatable: more than one --python installs into each of them
+            options.python_paths.append(args[i + 1])
+            options.python_path = options.python_paths[0]
             i += 1
         elif arg in ("--version", "-v") and i + 1 < len(args):
-            clyp_version = args[i + 1]
+            options.clyp_version = args[i + 1]
             i += 1
         elif arg in ("--uninstall", "-u"):
-            uninstall = True
+            options.uninstall = True
         elif arg in ("--silent", "-s"):
-            silent = True
+            options.silent = True
         elif arg in ("--gui", "-g"):
-            gui_mode = True
+            options.gui_mode = True
         elif arg in ("--console", "-c"):
-            gui_mode = False
+            options.gui_mode = False
+            options.console = True
+        elif arg == "--discovery-workers" and i + 1 < len(args):
+            options.discovery_workers = max(1, numeric_arg(arg, args[i + 1]))
+            i += 1
+        elif arg == "--probe-timeout" and i + 1 < len(args):
+            options.probe_timeout = numeric_arg(arg, args[i + 1], float)
+            i += 1
+        elif arg == "--no-cache":
+            options.use_cache = False
+        elif arg == "--backend" and i + 1 < len(args):
+            if args[i + 1] != "auto" and args[i + 1] not in INSTALLER_BACKENDS:
+                choices = ", ".join(["auto"] + list(INSTALLER_BACKENDS))
+                print(f"{RED}Unknown backend {args[i + 1]!r}; expected one of {choices}.{RESET}")
+                sys.exit(2)
+            options.backend = args[i + 1]
+            i += 1
+        elif arg == "--benchmark":
+            options.benchmark = True
+        elif arg == "--probe-only":
+            options.probe_only = True
+        elif arg == "--deep-verify":
+            options.deep_verify = True
+        elif arg in ("--force", "-f"):
+            options.force = True
+        elif arg == "--wheelhouse" and i + 1 < len(args):
+            options.wheelhouse = args[i + 1]
+            i += 1
+        elif arg == "--offline":
+            options.offline = True
+        elif arg == "--prefetch":
+            options.prefetch = True
+        elif arg == "--no-bundled":
+            options.use_bundled = False
+        elif arg == "--all-discovered":
+            options.all_discovered = True
+        elif arg == "--jobs" and i + 1 < len(args):
+            options.jobs = max(1, numeric_arg(arg, args[i + 1]))
+            i += 1
+        elif arg == "--cache-dir" and i + 1 < len(args):
+            options.cache_dir = args[i + 1]
+            i += 1
+        elif arg == "--cache-limit" and i + 1 < len(args):
+            options.cache_limit = numeric_arg(arg, args[i + 1])
+            i += 1
+        elif arg == "--manifest" and i + 1 < len(args):
+            options.manifest = args[i + 1]
+            i += 1
+        elif arg == "--report" and i + 1 < len(args):
+            options.report = args[i + 1]
+            i += 1
+        elif arg == "--metadata-url" and i + 1 < len(args):
+            options.metadata_url = args[i + 1]
+            i += 1
+        elif arg == "--timeout" and i + 1 < len(args):
+            options.timeout = numeric_arg(arg, args[i + 1], float) or None
+            i += 1
+        elif arg == "--step-timeout" and i + 1 < len(args):
+            options.step_timeout = numeric_arg(arg, args[i + 1], float) or None
+            i += 1
         i += 1
-    return python_path, clyp_version, uninstall, silent, gui_mode
+    return options
 
-class InstallWorker(QThread):
-    """Worker thread for installation to prevent UI freezing."""
-    progress = Signal(str)
-    finished = Signal(bool, str)
-    
-    def __init__(self, python_path: str, clyp_version: Optional[str], uninstall: bool):
-        super().__init__()
+class InstallEngine:
+    """Install or uninstall clyp in one interpreter, independent of any UI.
+
+    Subprocess output and status messages go to on_output; progress parsed
+    from installer output goes to on_progress as (percent, status).
+    """
+
+    def __init__(self, python_path: str, clyp_version: Optional[str], uninstall: bool,
+                 backend: str = "auto", on_output: Optional[Callable[[str], None]] = None,
+                 on_progress: Optional[Callable[[int, str], None]] = None,
+                 deep_verify: bool = False, force: bool = False,
+                 wheelhouse: Optional[Wheelhouse] = None, offline: bool = False,
+                 step_timeout: Optional[float] = STEP_TIMEOUT, cancel: Optional[CancelToken] = None):
         self.python_path = python_path
         self.clyp_version = clyp_version
         self.uninstall = uninstall
-    
-    def run(self):
-        try:
-            # Check pip availability
-            if not check_pip_exists(self.python_path):
-                self.progress.emit("pip not found. Attempting to install...")
-                if not offer_pip_install(self.python_path):
-                    self.finished.emit(False, "pip is required but could not be installed.")
-                    return
-            
-            if self.uninstall:
-                self.progress.emit("Uninstalling Clyp...")
-                result = subprocess.run([self.python_path, "-m", "pip", "uninstall", "-y", "clyp"],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    self.finished.emit(True, "Clyp has been uninstalled successfully!")
-                else:
-                    self.finished.emit(False, f"Uninstall failed: {result.stderr}")
-                return
-            
-            # Install Clyp
-            self.progress.emit("Installing Clyp...")
-            if self.clyp_version:
-                cmd = [self.python_path, "-m", "pip", "install", f"clyp=={self.clyp_version}"]
-            else:
-                cmd = [self.python_path, "-m", "pip", "install", "clyp"]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Check if installation succeeded
-            check_result = subprocess.run([self.python_path, "-c", "import clyp"],
-                                        capture_output=True, text=True)
-            
-            if check_result.returncode == 0:
-                self.finished.emit(True, "Clyp installed successfully!")
-            else:
-                # Try uv as fallback if in venv
-                if is_venv(self.python_path) and uv_exists(self.python_path):
-                    self.progress.emit("Trying installation with uv...")
-                    if self.clyp_version:
-                        uv_cmd = [self.python_path, "-m", "uv", "pip", "install", f"clyp=={self.clyp_version}"]
-                    else:
-                        uv_cmd = [self.python_path, "-m", "uv", "pip", "install", "clyp"]
-                    
-                    uv_result = subprocess.run(uv_cmd, capture_output=True, text=True)
-                    final_check = subprocess.run([self.python_path, "-c", "import clyp"],
-                                                capture_output=True, text=True)
-                    
-                    if final_check.returncode == 0:
-                        self.finished.emit(True, "Clyp installed successfully with uv!")
-                    else:
-                        self.finished.emit(False, f"Installation failed: {result.stderr}")
-                else:
-                    self.finished.emit(False, f"Installation failed: {result.stderr}")
-        
-        except Exception as e:
-            self.finished.emit(False, f"Installation error: {str(e)}")
+        self.backend = backend
+        self.deep_verify = deep_verify
+        self.force = force
+        self.wheelhouse = wheelhouse
+        self.offline = offline
+        self.step_timeout = step_timeout
+        self.cancel_token = cancel or CancelToken()
+        # Set when the wheelhouse was prefetched for this interpreter: try it offline first
+        self.prefer_local = False
+        # "installed", "uninstalled", "no-op", "cancelled" or "failed" once run() returns
+        self.status: Optional[str] = None
+        self.on_output = on_output or (lambda text: None)
+        self.on_progress = on_progress or (lambda percent, status: None)
+        self.parser = InstallProgressParser()
 
-class ClypInstallerGUI(QMainWindow):
-    """Main GUI window for Clyp installer wizard."""
-    
-    def __init__(self, python_path_arg=None, clyp_version_arg=None, uninstall=False, silent=False):
-        super().__init__()
-        self.python_candidates = python_candidates
-        self.current_page = 0
-        self.selected_python_path = None
-        self.selected_version = None
-        self.uninstall_mode = uninstall
-        self.silent = silent
-        self.python_path_arg = python_path_arg
-        self.clyp_version_arg = clyp_version_arg
-        self.init_ui()
-
-        # Pre-select python/version if provided
-        if self.python_path_arg:
-            # Try to select the matching python in the combo
-            for i in range(self.python_combo.count()):
-                item = self.python_combo.itemText(i)
-                if self.python_path_arg in item:
-                    self.python_combo.setCurrentIndex(i)
-                    break
-        if self.uninstall_mode:
-            self.uninstall_checkbox.setChecked(True)
-        if self.clyp_version_arg:
-            self.version_combo.setCurrentIndex(1)  # "Specify version..."
-            self.version_input.setText(self.clyp_version_arg)
-            self.version_input.setVisible(True)
-
-        # If silent, skip to install page and start installation
-        if self.silent:
-            self.selected_python_path = self.python_path_arg or self.get_selected_python_path()
-            if not self.selected_python_path:
-                QMessageBox.critical(self, "Error", "Could not determine Python path for silent install.")
-                self.close()
-                return
-            if not self.uninstall_mode:
-                if self.clyp_version_arg:
-                    self.selected_version = self.clyp_version_arg
-                elif "Specify version" in self.version_combo.currentText():
-                    self.selected_version = self.version_input.text().strip()
-                else:
-                    self.selected_version = None
-            self.current_page = 2  # Install page (adjusted index)
-            self.stacked_widget.setCurrentIndex(self.current_page)
-            self.update_navigation()
-            self.start_installation()
-    
-    def init_ui(self):
-        self.setWindowTitle("Clyp Installer")
-        self.setGeometry(200, 200, 700, 550)
-        
-        # Apply dark mode styling
-        self.setStyleSheet(self.get_dark_stylesheet())
-        
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        main_layout = QVBoxLayout(central_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        
-        # Stacked widget for pages
-        self.stacked_widget = QStackedWidget()
-        main_layout.addWidget(self.stacked_widget)
-        
-        # Create pages (remove welcome page)
-        # self.create_welcome_page()
-        self.create_license_page()
-        self.create_options_page()
-        self.create_install_page()
-        self.create_finish_page()
-        
-        # Navigation buttons
-        nav_layout = QHBoxLayout()
-        nav_layout.setContentsMargins(20, 10, 20, 20)
-        
-        self.back_button = QPushButton("← Back")
-        self.back_button.clicked.connect(self.go_back)
-        self.back_button.setEnabled(False)
-        
-        nav_layout.addWidget(self.back_button)
-        nav_layout.addStretch()
-        
-        self.next_button = QPushButton("Next →")
-        self.next_button.clicked.connect(self.go_next)
-        
-        self.cancel_button = QPushButton("Cancel")
-        self.cancel_button.clicked.connect(self.close)
-        
-        nav_layout.addWidget(self.next_button)
-        nav_layout.addWidget(self.cancel_button)
-        main_layout.addLayout(nav_layout)
-        
-        # Check if no Python candidates found
-        if not self.python_candidates:
-            self.show_no_python_error()
-    
-    # Remove create_welcome_page method
-    # def create_welcome_page(self):
-    #     ...existing code...
-
-    def create_license_page(self):
-        """Create license agreement page."""
-        page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setContentsMargins(40, 40, 40, 40)
-        layout.setSpacing(15)
-        
-        # Title
-        title = QLabel("License Agreement")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 20, QFont.Bold))
-        title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
-        layout.addWidget(title)
-        
-        # License text
-        license_text = QTextEdit()
-        license_text.setReadOnly(True)
-        license_text.setPlainText(f"""
-Copyright {YEAR} codesoft
-
-Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
-
-The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
-
-THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
-
-        """.strip())
-        layout.addWidget(license_text)
-        
-        # Agreement checkbox
-        self.license_checkbox = QCheckBox("I accept the terms of the license agreement")
-        self.license_checkbox.toggled.connect(self.on_license_toggle)
-        layout.addWidget(self.license_checkbox)
-        
-        self.stacked_widget.addWidget(page)
-    
-    def create_options_page(self):
-        """Create installation options page."""
-        page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setContentsMargins(40, 40, 40, 40)
-        layout.setSpacing(20)
-        
-        # Title
-        title = QLabel("Installation Options")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 20, QFont.Bold))
-        title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
-        layout.addWidget(title)
-        
-        # Python selection
-        python_label = QLabel("Select Python Installation:")
-        python_label.setFont(QFont("Arial", 12, QFont.Bold))
-        layout.addWidget(python_label)
-        
-        self.python_combo = QComboBox()
-        for candidate in self.python_candidates:
-            clean_text = candidate.replace(CYAN, "").replace(YELLOW, "").replace(RESET, "")
-            self.python_combo.addItem(clean_text)
-        layout.addWidget(self.python_combo)
-        
-        layout.addSpacing(15)
-        
-        # Uninstall option
-        self.uninstall_checkbox = QCheckBox("Uninstall Clyp instead of installing")
-        self.uninstall_checkbox.toggled.connect(self.on_uninstall_toggle)
-        layout.addWidget(self.uninstall_checkbox)
-        
-        layout.addSpacing(10)
-        
-        # Version selection
-        self.version_label = QLabel("Clyp Version:")
-        self.version_label.setFont(QFont("Arial", 12, QFont.Bold))
-        layout.addWidget(self.version_label)
-        
-        self.version_combo = QComboBox()
-        self.version_combo.addItem("Latest (recommended)")
-        self.version_combo.addItem("Specify version...")
-        self.version_combo.currentTextChanged.connect(self.on_version_change)
-        layout.addWidget(self.version_combo)
-        
-        # Custom version input
-        self.version_input = QLineEdit()
-        self.version_input.setPlaceholderText("Enter version (e.g., 1.2.3)")
-        self.version_input.hide()
-        layout.addWidget(self.version_input)
-        
-        layout.addStretch()
-        self.stacked_widget.addWidget(page)
-    
-    def create_install_page(self):
-        """Create installation progress page."""
-        page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setContentsMargins(40, 40, 40, 40)
-        layout.setSpacing(20)
-        
-        # Title
-        self.install_title = QLabel("Installing Clyp...")
-        self.install_title.setAlignment(Qt.AlignCenter)
-        self.install_title.setFont(QFont("Arial", 20, QFont.Bold))
-        self.install_title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
-        layout.addWidget(self.install_title)
-        
-        # Progress bar
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 0)  # Indeterminate
-        layout.addWidget(self.progress_bar)
-        
-        # Status text
-        self.status_text = QTextEdit()
-        self.status_text.setMaximumHeight(200)
-        self.status_text.setReadOnly(True)
-        layout.addWidget(self.status_text)
-        
-        layout.addStretch()
-        self.stacked_widget.addWidget(page)
-    
-    def create_finish_page(self):
-        """Create finish page."""
-        page = QWidget()
-        layout = QVBoxLayout(page)
-        layout.setContentsMargins(40, 40, 40, 40)
-        layout.setSpacing(20)
-        
-        # Title
-        self.finish_title = QLabel("Installation Complete!")
-        self.finish_title.setAlignment(Qt.AlignCenter)
-        self.finish_title.setFont(QFont("Arial", 24, QFont.Bold))
-        self.finish_title.setStyleSheet("color: #4CAF50; margin-bottom: 20px;")
-        layout.addWidget(self.finish_title)
-        
-        # Message
-        self.finish_message = QLabel("""
-        Clyp has been successfully installed!
-        
-        You can now use Clyp in your Python projects.
-        Restart your shell or IDE to ensure the installation is recognized.
-        
-        Thank you for using the Clyp installer.
-        """)
-        self.finish_message.setAlignment(Qt.AlignCenter)
-        self.finish_message.setWordWrap(True)
-        self.finish_message.setFont(QFont("Arial", 12))
-        self.finish_message.setStyleSheet("color: #b0b0b0; line-height: 1.4;")
-        layout.addWidget(self.finish_message)
-        
-        layout.addStretch()
-        self.stacked_widget.addWidget(page)
-    
-    def get_dark_stylesheet(self):
-        """Dark mode stylesheet."""
-        return """
-            QMainWindow {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-            }
-            QWidget {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-            }
-            QLabel {
-                color: #e0e0e0;
-                margin: 5px;
-            }
-            QPushButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                padding: 10px 20px;
-                border-radius: 6px;
-                font-weight: bold;
-                font-size: 11px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-            QPushButton:pressed {
-                background-color: #005a9e;
-            }
-            QPushButton:disabled {
-                background-color: #555;
-                color: #888;
-            }
-            QComboBox {
-                padding: 8px;
-                border: 1px solid #555;
-                border-radius: 4px;
-                background-color: #3c3c3c;
-                color: #e0e0e0;
-                selection-background-color: #0078d4;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 20px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #e0e0e0;
-                margin-right: 5px;
-            }
-            QLineEdit {
-                padding: 8px;
-                border: 1px solid #555;
-                border-radius: 4px;
-                background-color: #3c3c3c;
-                color: #e0e0e0;
-                selection-background-color: #0078d4;
-            }
-            QTextEdit {
-                border: 1px solid #555;
-                border-radius: 4px;
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-                font-family: 'Consolas', 'Monaco', monospace;
-                selection-background-color: #0078d4;
-            }
-            QProgressBar {
-                border: 1px solid #555;
-                border-radius: 4px;
-                background-color: #3c3c3c;
-                text-align: center;
-                color: #e0e0e0;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d4;
-                border-radius: 3px;
-            }
-            QCheckBox {
-                color: #e0e0e0;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                border-radius: 3px;
-                border: 1px solid #555;
-                background-color: #3c3c3c;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #0078d4;
-                border-color: #0078d4;
-            }
-            QCheckBox::indicator:checked::after {
-                content: "✓";
-                color: white;
-                font-weight: bold;
-            }
-            QScrollArea {
-                border: none;
-                background-color: #2b2b2b;
-            }
+    @classmethod
+    def from_options(cls, python_path: str, clyp_version: Optional[str], uninstall: bool,
+                     options: "InstallerOptions", wheelhouse: Optional[Wheelhouse] = None,
+                     cancel: Optional[CancelToken] = None, **callbacks) -> "InstallEngine":
+        """Build an engine with the command-line settings that apply to every install.
+
+        Pass wheelhouse and cancel to share them between engines running
+        concurrently; otherwise each engine gets its own, with the --timeout
+        deadline.
         """
-    
-    def on_license_toggle(self, checked):
-        """Handle license agreement toggle."""
-        if self.current_page == 1:  # License page
-            self.next_button.setEnabled(checked)
-    
-    def on_uninstall_toggle(self, checked):
-        """Toggle version selection visibility based on uninstall mode."""
-        self.uninstall_mode = checked
-        self.version_label.setVisible(not checked)
-        self.version_combo.setVisible(not checked)
-        if self.version_input.isVisible():
-            self.version_input.setVisible(not checked)
-    
-    def on_version_change(self, text):
-        """Show/hide custom version input based on selection."""
-        show_input = "Specify version" in text
-        self.version_input.setVisible(show_input)
-    
-    def go_back(self):
-        """Navigate to previous page."""
-        if self.current_page > 0:  # Adjusted: now first page is license
-            self.current_page -= 1
-            self.stacked_widget.setCurrentIndex(self.current_page)
-            self.update_navigation()
-    
-    def go_next(self):
-        """Navigate to next page or start installation."""
-        if self.current_page == 1:  # Options page (was 2, now 1)
-            # Validate and store options
-            self.selected_python_path = self.get_selected_python_path()
-            if not self.selected_python_path:
-                QMessageBox.warning(self, "Error", "Could not determine Python path.")
-                return
-            
-            if not self.uninstall_mode:
-                if "Specify version" in self.version_combo.currentText():
-                    self.selected_version = self.version_input.text().strip()
-                    if not self.selected_version:
-                        QMessageBox.warning(self, "Error", "Please enter a version number.")
-                        return
-                else:
-                    self.selected_version = None
-            
-            # Move to install page and start installation
-            self.current_page += 1
-            self.stacked_widget.setCurrentIndex(self.current_page)
-            self.update_navigation()
-            self.start_installation()
-        elif self.current_page < 3:
-            self.current_page += 1
-            self.stacked_widget.setCurrentIndex(self.current_page)
-            self.update_navigation()
-        elif self.current_page == 3:  # Finish page
-            self.close()
-    
-    def update_navigation(self):
-        """Update navigation button states."""
-        if self.current_page == 0:  # License page - show Back disabled, Next enabled if checked
-            self.back_button.setVisible(True)
-            self.next_button.setVisible(True)
-            self.back_button.setEnabled(False)
-            self.next_button.setEnabled(self.license_checkbox.isChecked())
-            self.next_button.setText("Next →")
-            self.cancel_button.setEnabled(True)
+        return cls(python_path, None if uninstall else clyp_version, uninstall,
+                   backend=options.backend, deep_verify=options.deep_verify, force=options.force,
+                   wheelhouse=wheelhouse or options.get_wheelhouse(), offline=options.offline,
+                   step_timeout=options.step_timeout, cancel=cancel or CancelToken(options.timeout),
+                   **callbacks)
+
+    def stream(self, cmd: List[str]) -> Tuple[int, str]:
+        """Run cmd, forwarding its output and parsed progress.
+
+        pip's raw progress lines (one per downloaded chunk) only feed the
+        parser; they are not forwarded as output.
+        """
+        self.parser = InstallProgressParser()
+
+        def on_output(text):
+            changed = False
+            shown = []
+            for line in text.splitlines():
+                download_cache.observe(line)
+                changed = self.parser.feed(line) or changed
+                if not _RAW_PROGRESS_RE.match(line):
+                    shown.append(line)
+            if shown:
+                self.on_output("\n".join(shown))
+            if changed:
+                self.on_progress(self.parser.percent, self.parser.status())
+
+        return run_streaming(cmd, on_output, timeout=self.step_timeout, cancel=self.cancel_token)
+
+    def cancel(self, reason: str = "Cancelled by the user.") -> None:
+        """Stop the run from another thread; the current command's process tree is killed."""
+        self.cancel_token.cancel(reason)
+
+    def already_satisfied(self) -> Optional[str]:
+        """The installed clyp version if it already matches the request, else None.
+
+        Without an explicit version, "latest" is resolved through
+        latest_clyp_version(), whose answer is cached on disk, or from the
+        wheelhouse when offline or when it is a pinned bundle.
+        """
+        installed = installed_clyp_version(self.python_path)
+        if self.uninstall or self.force or not installed:
+            return None
+        if self.clyp_version:
+            wanted = self.clyp_version
+        elif self.offline or (self.wheelhouse and self.wheelhouse.pinned):
+            wanted = self.wheelhouse.latest("clyp") if self.wheelhouse else None
         else:
-            self.back_button.setVisible(True)
-            self.next_button.setVisible(True)
-            self.back_button.setEnabled(self.current_page > 0 and self.current_page != 2)
-            
-            if self.current_page == 1:  # Options page
-                self.next_button.setEnabled(True)
-                self.next_button.setText("Next →")
-                self.cancel_button.setEnabled(True)
-            elif self.current_page == 2:  # Install page
-                self.next_button.setEnabled(False)
-                self.cancel_button.setEnabled(False)
-            elif self.current_page == 3:  # Finish page
-                self.next_button.setText("Finish")
-                self.cancel_button.setEnabled(False)
-            else:
-                self.next_button.setEnabled(True)
-                if self.current_page < 3:
-                    self.next_button.setText("Next →")
-    
-    def show_no_python_error(self):
-        """Show error when no Python installations are found."""
-        QMessageBox.critical(self, "No Python Found", 
-                           "No Python installations found on your system.\n"
-                           "Please install Python from https://www.python.org/downloads/")
-        self.close()
-    
-    def get_selected_python_path(self):
-        """Extract Python path from selected combo item."""
-        selected_text = self.python_combo.currentText()
-        if "(" in selected_text and ")" in selected_text:
-            return selected_text.split("(")[-1].strip(")")
+            wanted = latest_clyp_version()
+        if wanted and same_version(installed, wanted):
+            return installed
         return None
-    
-    def start_installation(self):
-        """Start the installation process."""
-        self.install_title.setText("Uninstalling Clyp..." if self.uninstall_mode else "Installing Clyp...")
-        self.progress_bar.show()
-        self.status_text.clear()
-        
-        # Start worker thread
-        self.worker = InstallWorker(self.selected_python_path, self.selected_version, self.uninstall_mode)
-        self.worker.progress.connect(self.update_progress)
-        self.worker.finished.connect(self.installation_finished)
-        self.worker.start()
-    
-    def update_progress(self, message):
-        """Update progress display."""
-        self.status_text.append(message)
-    
-    def installation_finished(self, success, message):
-        """Handle installation completion."""
-        if success:
-            self.finish_title.setText("Success!")
-            self.finish_title.setStyleSheet("color: #4CAF50; margin-bottom: 20px;")
-            self.finish_message.setText(message + "\n\nYou can now close this installer.")
-        else:
-            self.finish_title.setText("Installation Failed")
-            self.finish_title.setStyleSheet("color: #f44336; margin-bottom: 20px;")
-            self.finish_message.setText(f"Error: {message}\n\nPlease check the installation log above.")
-        
-        # Move to finish page
-        self.current_page = 3
-        self.stacked_widget.setCurrentIndex(self.current_page)
-        self.update_navigation()
+
+    def source_passes(self, clyp_version: Optional[str]) -> List[bool]:
+        """The offline flags to try in order.
+
+        With bundled wheels (or a wheelhouse prefetched for this interpreter)
+        that include the wanted clyp, install offline from them first and
+        only fall back to the index if that fails.
+        """
+        local = self.wheelhouse is not None and (self.wheelhouse.pinned or self.prefer_local)
+        if local and clyp_version and not self.offline and not self.uninstall:
+            if any(same_version(v, clyp_version) for v, _ in self.wheelhouse.wheels("clyp")):
+                return [True, False]
+        return [self.offline]
+
+    def _try_backends(self, clyp_version: Optional[str], offline: bool,
+                      wheelhouse: Optional[Wheelhouse]) -> Tuple[bool, str]:
+        """Walk the backends once; return (True, message) or (False, last output)."""
+        output = ""
+        for backend in create_backends(self.python_path, self.backend, runner=self.stream,
+                                       deep_verify=self.deep_verify, wheelhouse=wheelhouse,
+                                       offline=offline, cancel=self.cancel_token):
+            self.cancel_token.check()
+            with run_report.span("prepare", python=self.python_path, backend=backend.name) as span:
+                span["success"] = backend.prepare(self.on_output)
+            if not span["success"]:
+                output = output or f"{backend.name} is required but could not be set up."
+                continue
+
+            action = "Uninstalling" if self.uninstall else "Installing"
+            self.on_output(f"{action} Clyp with {backend.describe()}...")
+            operation = "uninstall" if self.uninstall else "install"
+            with run_report.span(operation, python=self.python_path, backend=backend.name,
+                                 offline=offline) as span:
+                try:
+                    if self.uninstall:
+                        result = backend.uninstall()
+                    else:
+                        result = backend.install(clyp_version)
+                except BackendSkipped as e:
+                    span["skipped"] = str(e)
+                    self.on_output(f"Skipping {backend.name}: {e}")
+                    continue
+                span["success"] = result.success
+            output = result.output
+
+            if result.success:
+                done = "Uninstalled" if self.uninstall else "Installed"
+                self.on_output(f"{done} with {backend.name} in {result.elapsed:.1f}s")
+                if self.uninstall:
+                    return True, "Clyp has been uninstalled successfully!"
+                return True, f"Clyp installed successfully with {backend.name}!"
+            self.on_output(f"{backend.name} failed after {result.elapsed:.1f}s")
+        return False, output
+
+    def run(self) -> Tuple[bool, str]:
+        """Try each backend in turn; return (success, message)."""
+        operation = "uninstall" if self.uninstall else "install"
+        with run_report.span("engine", python=self.python_path, operation=operation) as span:
+            success, message = self._run()
+            if self.status is None:
+                self.status = ("uninstalled" if self.uninstall else "installed") if success else "failed"
+            span["status"] = self.status
+        return success, message
+
+    def _run(self) -> Tuple[bool, str]:
+        try:
+            with run_report.span("check", python=self.python_path):
+                if introspect_python(self.python_path) is None:
+                    return False, f"Could not run the Python interpreter at {self.python_path}."
+                if self.uninstall and not self.force and not clyp_present(self.python_path):
+                    self.status = "no-op"
+                    return True, "Clyp is not installed; nothing to do."
+                if self.clyp_version and not self.uninstall and not self.offline:
+                    # Catch typos before any installer runs
+                    problem = version_catalog.check(self.clyp_version)
+                    if problem:
+                        return False, problem
+                satisfied = self.already_satisfied()
+            if satisfied:
+                self.status = "no-op"
+                return True, f"Clyp {satisfied} is already installed; nothing to do."
+            clyp_version = self.clyp_version
+            if not clyp_version and not self.uninstall and self.wheelhouse and self.wheelhouse.pinned:
+                clyp_version = self.wheelhouse.latest("clyp")
+            output = ""
+            passes = self.source_passes(clyp_version)
+            source = "the bundled wheels" if self.wheelhouse and self.wheelhouse.pinned else "the wheelhouse"
+            for attempt, offline in enumerate(passes):
+                if attempt:
+                    self.on_output(f"Could not install from {source}; using the package index...")
+                elif len(passes) > 1:
+                    self.on_output(f"Installing Clyp {clyp_version} from {source}...")
+                # Never install from a wheel that changed since it was stored
+                wheelhouse = self.wheelhouse
+                damaged = wheelhouse.verify() if wheelhouse and not self.uninstall else []
+                if damaged:
+                    hint = "" if wheelhouse.pinned else "; run --prefetch again"
+                    output = f"Damaged or missing wheels in {source}: {', '.join(damaged)}{hint}."
+                    self.on_output(output)
+                    if offline:
+                        continue
+                    wheelhouse = None  # the index alone still works
+                success, output = self._try_backends(clyp_version, offline, wheelhouse)
+                if success:
+                    return True, output
+
+            if self.uninstall:
+                return False, f"Uninstall failed: {output}"
+            return False, f"Installation failed: {output}"
+
+        except InstallCancelled as e:
+            self.status = "cancelled"
+            return False, str(e)
+        except Exception as e:
+            return False, f"Installation error: {str(e)}"
 
 def is_running_as_executable():
     """Detect if the script is running as a compiled executable."""
@@ -710,101 +2549,414 @@ def is_running_in_terminal():
     except (AttributeError, OSError):
         return False
 
+def gui_available() -> bool:
+    """Whether PySide6 can be imported, without paying for the import."""
+    import importlib.util
+    return importlib.util.find_spec("PySide6") is not None
+
+def choose_interactively(options: InstallerOptions) -> Optional[str]:
+    """Prompt for the interpreter and version in a terminal; return the python path."""
+    candidates = python_discovery.candidates()
+    if not candidates:
+        print(f"{RED}No Python installations found on your system.{RESET}")
+        print(f"{YELLOW}Please install Python from https://www.python.org/downloads/{RESET}")
+        return None
+    try:
+        import inquirer
+    except ImportError:
+        inquirer = None
+    if inquirer is not None:
+        labels = [candidate.label(color=True) for candidate in candidates]
+        questions = [inquirer.List("python", message="Select Python installation", choices=labels)]
+        if not options.uninstall and not options.clyp_version:
+            questions.append(inquirer.Text("version", message="Clyp version (blank for latest)"))
+        answers = inquirer.prompt(questions)
+        if not answers:
+            return None
+        options.clyp_version = (answers.get("version") or "").strip() or options.clyp_version
+        return candidates[labels.index(answers["python"])].path
+    for index, candidate in enumerate(candidates, 1):
+        print(f"  {index}. {candidate.label(color=True)}")
+    choice = input("Select Python installation [1]: ").strip() or "1"
+    if not choice.isdigit() or not 1 <= int(choice) <= len(candidates):
+        print(f"{RED}Invalid selection.{RESET}")
+        return None
+    if not options.uninstall and not options.clyp_version:
+        options.clyp_version = input("Clyp version (blank for latest): ").strip() or None
+    return candidates[int(choice) - 1].path
+
+def run_headless(options: InstallerOptions) -> int:
+    """Console install/uninstall without Qt; returns the process exit code.
+
+    --silent never prompts and only prints the outcome; --console streams the
+    installer output and prompts for anything not given on the command line.
+    """
+    python_path = options.python_path
+    if not python_path:
+        if options.silent or not is_running_in_terminal():
+            candidate = python_discovery.first()
+            python_path = candidate.path if candidate else None
+            if not python_path:
+                print(f"{RED}Could not determine Python path for silent install.{RESET}")
+                return 1
+        else:
+            python_path = choose_interactively(options)
+            if not python_path:
+                return 1
+
+    def on_output(text):
+        if not options.silent:
+            print(text, flush=True)
+
+    cancel = CancelToken(options.timeout)
+    cancel_on_sigint(cancel)
+    engine = InstallEngine.from_options(python_path, options.clyp_version, options.uninstall,
+                                        options, cancel=cancel, on_output=on_output)
+    success, message = engine.run()
+    if download_cache.active() and not options.silent:
+        print(f"{CYAN}{download_cache.summary()}{RESET}")
+    print(f"{GREEN if success else RED}{message}{RESET}")
+    if engine.status == "cancelled":
+        return 130
+    return 0 if success else 1
+
+def batch_targets(options: InstallerOptions) -> List[str]:
+    """Interpreters for a batch run: every --python, plus discovered ones, deduplicated."""
+    paths = list(options.python_paths)
+    if options.all_discovered:
+        paths += [candidate.path for candidate in python_discovery.candidates()]
+    targets = {}
+    for path in paths:
+        # Not realpath: venv interpreters are symlinks to the same base binary
+        targets.setdefault(os.path.normcase(os.path.abspath(path)), path)
+    return list(targets.values())
+
+def run_batch(options: InstallerOptions) -> int:
+    """Install or uninstall in several interpreters at once and print a result table.
+
+    Up to --jobs engines run concurrently. They share one wheelhouse, so the
+    wheel backend downloads each clyp wheel once, and pip and uv share the
+    installer's download cache. --silent hides the installer output, leaving
+    the table.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    targets = batch_targets(options)
+    if not targets:
+        print(f"{RED}No Python interpreters found for batch install.{RESET}")
+        return 1
+    wheelhouse = options.get_wheelhouse() or Wheelhouse(default_wheelhouse_dir())
+    cancel = CancelToken(options.timeout)
+    cancel_on_sigint(cancel)
+    action = "Uninstalling" if options.uninstall else "Installing"
+    print(f"{CYAN}{action} Clyp in {len(targets)} interpreters ({options.jobs} at a time)...{RESET}")
+    for number, path in enumerate(targets, 1):
+        print(f"  [{number}] {path}")
+
+    def install_one(number: int, path: str) -> Tuple[InstallEngine, bool, str, float]:
+        def on_output(text):
+            if not options.silent:
+                print(f"[{number}] {text}", flush=True)
+
+        engine = InstallEngine.from_options(path, options.clyp_version, options.uninstall, options,
+                                            wheelhouse=wheelhouse, cancel=cancel, on_output=on_output)
+        started = time.monotonic()
+        success, message = engine.run()
+        return engine, success, message, time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=options.jobs) as pool:
+        results = list(pool.map(install_one, range(1, len(targets) + 1), targets))
+
+    width = max(len(path) for path in targets)
+    print()
+    print(f"     {'Interpreter':<{width}}  {'Python':<8}  {'Status':<11}  {'Time':>7}")
+    for number, (path, (engine, success, message, elapsed)) in enumerate(zip(targets, results), 1):
+        record = introspect_python(path) or {}
+        color = GREEN if success else RED
+        print(f"{color}[{number:>2}] {path:<{width}}  {record.get('version', '?'):<8}  "
+              f"{engine.status:<11}  {elapsed:6.1f}s{RESET}")
+    for number, (engine, success, message, elapsed) in enumerate(results, 1):
+        if not success:
+            print(f"{RED}[{number}] {message}{RESET}")
+    if download_cache.active():
+        print(f"{CYAN}{download_cache.summary()}{RESET}")
+    return 0 if all(success for _, success, _, _ in results) else 1
+
+MANIFEST_ACTIONS = ("install", "uninstall")
+
+class ManifestTarget(NamedTuple):
+    """One interpreter and what to do with it, as listed in a manifest."""
+    python: str
+    version: Optional[str]
+    action: str
+    venv: Optional[str] = None
+
+def venv_python(venv_dir: str) -> str:
+    if system == "Windows":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+def load_manifest(path: str) -> List[ManifestTarget]:
+    """Read a JSON or TOML (.toml, Python 3.11+) manifest; raise ValueError if it is malformed.
+
+    Each entry of "targets" names an interpreter ("python") or a venv
+    directory ("venv") and may set "version" and "action" (install or
+    uninstall); "defaults" supplies the keys an entry leaves out. Relative
+    paths are relative to the manifest, and a bare interpreter name such as
+    "python3.12" is looked up on PATH.
+    """
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    if path.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML manifests need Python 3.11 or newer; use JSON instead")
+        manifest = tomllib.loads(text)
+    else:
+        manifest = json.loads(text)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("targets"), list):
+        raise ValueError('expected a "targets" list')
+
+    base = os.path.dirname(os.path.abspath(path))
+    defaults = manifest.get("defaults") or {}
+    targets, seen = [], set()
+    for number, entry in enumerate(manifest["targets"], 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"target {number} is not a table/object")
+        entry = dict(defaults, **entry)
+        venv = entry.get("venv")
+        if venv:
+            venv = os.path.join(base, os.path.expanduser(venv))
+            python = venv_python(venv)
+        elif entry.get("python"):
+            python = os.path.expanduser(entry["python"])
+            if os.sep in python or (os.altsep and os.altsep in python):
+                python = os.path.join(base, python)
+            else:
+                # Left as-is when missing: the probe then reports the target as failed
+                python = shutil.which(python) or python
+        else:
+            raise ValueError(f'target {number} needs "python" or "venv"')
+        action = entry.get("action", "install")
+        if action not in MANIFEST_ACTIONS:
+            raise ValueError(f"target {number}: action must be one of {', '.join(MANIFEST_ACTIONS)}")
+        version = entry.get("version")
+        version = None if version in (None, "", "latest") else str(version)
+        key = os.path.normcase(os.path.abspath(python))
+        if key in seen:
+            raise ValueError(f"target {number}: {python} is listed more than once")
+        seen.add(key)
+        targets.append(ManifestTarget(python, version, action, venv))
+    return targets
+
+def plan_prefetch(targets: List[ManifestTarget], records: Dict[ManifestTarget, Optional[Dict[str, Any]]],
+                  latest: Optional[str], force: bool = False) -> List[List[ManifestTarget]]:
+    """Group the installs that would download the same wheels.
+
+    Targets that want the same clyp release on the same kind of interpreter
+    (implementation, ABI, platform) need identical wheels, so each group of
+    two or more is prefetched once into the wheelhouse. Targets that are
+    already up to date are left out.
+    """
+    groups: Dict[Tuple, List[ManifestTarget]] = {}
+    for target in targets:
+        record = records.get(target)
+        wanted = target.version or latest
+        if target.action != "install" or not record or not wanted:
+            continue
+        installed = (record.get("distributions") or {}).get("clyp")
+        if installed and not force and same_version(installed, wanted):
+            continue
+        key = (wanted, record.get("implementation"), record.get("soabi") or record.get("version"),
+               record.get("sys_platform"), record.get("machine"))
+        groups.setdefault(key, []).append(target)
+    return [group for group in groups.values() if len(group) > 1]
+
+def run_manifest(options: InstallerOptions) -> int:
+    """Carry out a manifest and print a JSON summary on stdout.
+
+    Interpreters are probed in parallel, "latest" is resolved once for all
+    targets, shared downloads are prefetched once per group (plan_prefetch),
+    then up to --jobs targets are installed at once, preferring the
+    prefetched wheels. Progress goes to stderr (hidden by --silent).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.monotonic()
+
+    def log(text):
+        if not options.silent:
+            print(text, file=sys.stderr, flush=True)
+
+    try:
+        targets = load_manifest(options.manifest)
+    except (OSError, ValueError) as e:
+        print(f"{RED}Invalid manifest {options.manifest}: {e}{RESET}", file=sys.stderr)
+        return 2
+    wheelhouse = options.get_wheelhouse() or Wheelhouse(default_wheelhouse_dir())
+    local_only = options.offline or wheelhouse.pinned
+    cancel = CancelToken(options.timeout)
+    cancel_on_sigint(cancel)
+
+    with ThreadPoolExecutor(max_workers=options.jobs) as pool:
+        records = dict(zip(targets, pool.map(lambda target: introspect_python(target.python), targets)))
+        latest = None
+        if any(target.action == "install" and not target.version for target in targets):
+            # Resolved once so every target converges on the same release
+            latest = wheelhouse.latest("clyp") if local_only else latest_clyp_version()
+
+        groups = [] if local_only else plan_prefetch(targets, records, latest, options.force)
+        for group in groups:
+            log(f"Prefetching Clyp {group[0].version or latest} for {len(group)} interpreters "
+                f"like {group[0].python}...")
+
+        def prefetch(group):
+            try:
+                success, _ = prefetch_wheels(group[0].python, group[0].version or latest, wheelhouse,
+                                             on_output=log, cancel=cancel)
+            except InstallCancelled:
+                return False
+            return success
+
+        prefetched = set()
+        for group, success in zip(groups, pool.map(prefetch, groups)):
+            if success:
+                prefetched.update(group)
+
+        def run_target(number: int, target: ManifestTarget) -> Dict[str, Any]:
+            def on_output(text):
+                log(f"[{number}] {text}")
+
+            engine = InstallEngine.from_options(target.python, target.version or latest,
+                                                target.action == "uninstall", options,
+                                                wheelhouse=wheelhouse, cancel=cancel,
+                                                on_output=on_output)
+            engine.prefer_local = target in prefetched
+            target_started = time.monotonic()
+            success, message = engine.run()
+            return {
+                "python": target.python,
+                "venv": target.venv,
+                "action": target.action,
+                "requested": None if target.action == "uninstall" else target.version or latest,
+                "installed": installed_clyp_version(target.python) if records[target] else None,
+                "status": engine.status,
+                "success": success,
+                "message": message,
+                "elapsed": round(time.monotonic() - target_started, 3),
+            }
+
+        results = list(pool.map(run_target, range(1, len(targets) + 1), targets))
+
+    failed = sum(1 for result in results if not result["success"])
+    print(json.dumps({
+        "manifest": os.path.abspath(options.manifest),
+        "latest": latest,
+        "prefetched": [{"version": group[0].version or latest, "targets": len(group),
+                        "success": group[0] in prefetched} for group in groups],
+        "targets": results,
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed": round(time.monotonic() - started, 3),
+    }, indent=2))
+    return 0 if failed == 0 else 1
+
 def main():
-    python_path_arg, clyp_version_arg, uninstall, silent, gui_mode = parse_args()
+    options = parse_args()
+    python_discovery.max_workers = options.discovery_workers
+    python_discovery.timeout = options.probe_timeout
+    interpreter_cache.enabled = options.use_cache
+    if options.cache_dir:
+        download_cache.root = os.path.abspath(options.cache_dir)
+    download_cache.max_mb = options.cache_limit
+    if options.metadata_url:
+        version_catalog.base_url = options.metadata_url.rstrip("/")
 
-    if not GUI_AVAILABLE:
-        print(f"{RED}GUI mode is required but PySide6 is not installed.{RESET}")
-        print(f"{YELLOW}Install with: pip install PySide6{RESET}")
+    if not options.report:
+        dispatch(options)
+        return
+    run_report.enabled = True
+    exit_code = 1
+    try:
+        dispatch(options)
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        raise
+    finally:
+        try:
+            run_report.write(options.report, exit_code)
+        except OSError as e:
+            print(f"{RED}Could not write the report to {options.report}: {e}{RESET}", file=sys.stderr)
+
+def dispatch(options: InstallerOptions):
+    """Run the mode selected on the command line; may exit via sys.exit."""
+    if options.benchmark:
+        # It installs and uninstalls clyp repeatedly, so never pick an interpreter implicitly
+        if not options.python_path:
+            print(f"{RED}--benchmark needs --python: it installs and uninstalls clyp in that interpreter.{RESET}")
+            sys.exit(2)
+        python_path = options.python_path
+        names = None if options.backend == "auto" else [options.backend]
+        cancel = CancelToken(options.timeout)
+        cancel_on_sigint(cancel)
+        print(f"{CYAN}Benchmarking installer backends against {python_path}...{RESET}")
+        try:
+            results = benchmark_backends(python_path, options.clyp_version, names,
+                                         wheelhouse=options.get_wheelhouse(), offline=options.offline,
+                                         step_timeout=options.step_timeout, cancel=cancel)
+        except InstallCancelled as e:
+            print(f"{YELLOW}{e}{RESET}")
+            sys.exit(130)
+        for result in results:
+            color = GREEN if result.success else RED
+            print(f"{color}{result.backend:<8} {result.operation:<10} {result.elapsed:8.2f}s{RESET}")
         return
 
-    app = QApplication(sys.argv)
-    window = ClypInstallerGUI(
-        python_path_arg=python_path_arg,
-        clyp_version_arg=clyp_version_arg,
-        uninstall=uninstall,
-        silent=silent
-    )
-    window.show()
-    sys.exit(app.exec())
+    if options.probe_only:
+        # Print the introspection record and stop; bench_startup.py times this
+        python_path = options.python_path or getattr(python_discovery.first(), "path", None)
+        record = introspect_python(python_path) if python_path else None
+        print(json.dumps(record, indent=2))
+        sys.exit(0 if record else 1)
 
-if __name__ == "__main__":
-    main()
-    
-    def installation_finished(self, success, message):
-        """Handle installation completion."""
+    if options.prefetch:
+        python_path = options.python_path or getattr(python_discovery.first(), "path", None)
+        if not python_path:
+            print(f"{RED}No Python interpreter found to prefetch wheels for.{RESET}")
+            sys.exit(1)
+        wheelhouse = options.get_wheelhouse()
+        print(f"{CYAN}Prefetching wheels for {python_path} into {wheelhouse.root}...{RESET}")
+        success, stored = prefetch_wheels(python_path, options.clyp_version, wheelhouse)
         if success:
-            self.finish_title.setText("Success!")
-            self.finish_title.setStyleSheet("color: #4CAF50; margin-bottom: 20px;")
-            self.finish_message.setText(message + "\n\nYou can now close this installer.")
+            print(f"{GREEN}Stored {stored} wheels in {wheelhouse.root}{RESET}")
         else:
-            self.finish_title.setText("Installation Failed")
-            self.finish_title.setStyleSheet("color: #f44336; margin-bottom: 20px;")
-            self.finish_message.setText(f"Error: {message}\n\nPlease check the installation log above.")
-        
-        # Move to finish page
-        self.current_page = 4
-        self.stacked_widget.setCurrentIndex(self.current_page)
-        self.update_navigation()
-
-    def launch_cli_installer(self):
-        """Close GUI and relaunch script in console mode."""
-        import subprocess
-        self.close()
-        # Relaunch the script with --console argument
-        args = [sys.executable] + [sys.argv[0]] + [arg for arg in sys.argv[1:] if arg not in ("--gui", "-g")]
-        if "--console" not in args and "-c" not in args:
-            args.append("--console")
-        subprocess.Popen(args)
-        # Optionally, you can use os.execv to replace the current process
-
-    def continue_with_gui(self):
-        """Proceed to the next page in the GUI wizard."""
-        self.current_page = 1
-        self.stacked_widget.setCurrentIndex(self.current_page)
-        self.update_navigation()
+            print(f"{RED}Prefetching wheels failed.{RESET}")
+        sys.exit(0 if success else 1)
 
-def is_running_as_executable():
-    """Detect if the script is running as a compiled executable."""
-    # Check for PyInstaller
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        return True
-    
-    # Check for cx_Freeze
-    if getattr(sys, 'frozen', False):
-        return True
-    
-    # Check for auto-py-to-exe / PyInstaller (alternative check)
-    if hasattr(sys, 'executable') and sys.executable.endswith('.exe') and not sys.executable.endswith('python.exe'):
-        return True
-    
-    return False
+    if options.manifest:
+        sys.exit(run_manifest(options))
 
-def is_running_in_terminal():
-    """Detect if the script is running in a terminal/console."""
-    try:
-        # Check if stdin/stdout are connected to a terminal
-        return sys.stdin.isatty() and sys.stdout.isatty()
-    except (AttributeError, OSError):
-        return False
+    if options.is_batch():
+        sys.exit(run_batch(options))
 
-def main():
-    python_path_arg, clyp_version_arg, uninstall, silent, gui_mode = parse_args()
+    if not options.gui_mode and (options.silent or options.console):
+        sys.exit(run_headless(options))
 
-    if not GUI_AVAILABLE:
+    if not gui_available():
+        if is_running_in_terminal():
+            print(f"{YELLOW}PySide6 is not installed; continuing in console mode.{RESET}")
+            sys.exit(run_headless(options))
         print(f"{RED}GUI mode is required but PySide6 is not installed.{RESET}")
-        print(f"{YELLOW}Install with: pip install PySide6{RESET}")
+        print(f"{YELLOW}Install with: pip install PySide6, or run with --console{RESET}")
         return
 
-    app = QApplication(sys.argv)
-    window = ClypInstallerGUI(
-        python_path_arg=python_path_arg,
-        clyp_version_arg=clyp_version_arg,
-        uninstall=uninstall,
-        silent=silent
-    )
-    window.show()
-    sys.exit(app.exec())
+    import install_gui
+    sys.exit(install_gui.run(options))
 
 if __name__ == "__main__":
+    # install_gui imports this module as "install"; let it reuse this instance
+    # (and its caches) instead of loading the script a second time.
+    sys.modules.setdefault("install", sys.modules[__name__])
     main()
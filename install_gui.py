@@ -0,0 +1,788 @@
+"""PySide6 wizard for the Clyp installer.
+
+Imported by install.main() only when the GUI is actually shown, so console and
+silent runs never pay for Qt.
+"""
+import bisect
+import datetime
+import os
+import sys
+from collections import deque
+from typing import IO, List, Optional
+
+from PySide6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
+                               QWidget, QLabel, QComboBox, QPushButton, QLineEdit, 
+                               QPlainTextEdit, QProgressBar, QCheckBox, QMessageBox,
+                               QStackedWidget)
+from PySide6.QtCore import QThread, QTimer, Signal, Qt
+from PySide6.QtGui import QFont
+
+from install import (InstallEngine, InstallerOptions, PythonCandidate, download_cache,
+                     python_discovery, same_version, user_cache_dir, version_catalog, version_key)
+
+YEAR = datetime.datetime.now().year
+
+# Lines kept in the install log pane; the full log of each run goes to a
+# file in LOG_DIR, of which the newest LOG_KEEP are kept
+LOG_LINES = 2000
+LOG_FLUSH_MS = 100
+LOG_DIR = "logs"
+LOG_KEEP = 20
+
+def new_log_path() -> str:
+    """A log file name unique to this run (timestamp and PID); older logs beyond LOG_KEEP are removed."""
+    directory = os.path.join(user_cache_dir(), LOG_DIR)
+    try:
+        logs = sorted(name for name in os.listdir(directory) if name.startswith("gui-install-"))
+    except OSError:
+        logs = []
+    for name in logs[:max(0, len(logs) - LOG_KEEP + 1)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"gui-install-{stamp}-{os.getpid()}.log")
+
+class LogView(QPlainTextEdit):
+    """Read-only install log that appends in batches and keeps only the last lines.
+
+    Messages are queued and written to the widget at most every LOG_FLUSH_MS,
+    so a verbose pip run repaints a few times per second instead of once per
+    line. Every message is also written to a spill file when one is open.
+    """
+
+    def __init__(self, max_lines: int = LOG_LINES, interval_ms: int = LOG_FLUSH_MS):
+        super().__init__()
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_lines)
+        # Ring buffer: a burst larger than the pane only keeps what would stay visible
+        self.pending: deque = deque(maxlen=max_lines)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.flush)
+        self.spill: Optional[IO[str]] = None
+        self.spill_path: Optional[str] = None
+
+    def start(self, path: Optional[str] = None):
+        """Clear the pane and, if given, start writing the full log to path."""
+        self.close_spill()
+        self.pending.clear()
+        self.clear()
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self.spill = open(path, "w", encoding="utf-8", errors="replace")
+                self.spill_path = path
+            except OSError:
+                self.spill = self.spill_path = None
+
+    def write(self, message: str):
+        self.pending.append(message)
+        if self.spill is not None:
+            self.spill.write(message + "\n")
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        """Append everything queued since the last flush in one go."""
+        self.timer.stop()
+        if self.pending:
+            self.appendPlainText("\n".join(self.pending))
+            self.pending.clear()
+        if self.spill is not None:
+            self.spill.flush()
+
+    def close_spill(self):
+        self.flush()
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+class InstallWorker(QThread):
+    """Worker thread for installation to prevent UI freezing."""
+    progress = Signal(str)
+    progress_value = Signal(int, str)
+    finished = Signal(bool, str)
+    
+    def __init__(self, python_path: str, clyp_version: Optional[str], uninstall: bool,
+                 options: InstallerOptions):
+        super().__init__()
+        self.engine = InstallEngine.from_options(python_path, clyp_version, uninstall, options,
+                                                 on_output=self.progress.emit,
+                                                 on_progress=self.progress_value.emit)
+    
+    def cancel(self):
+        """Ask the engine to stop; its running command is killed and finished is still emitted."""
+        self.engine.cancel()
+
+    def run(self):
+        result = self.engine.run()
+        if download_cache.active():
+            self.progress.emit(download_cache.summary())
+        self.finished.emit(*result)
+
+class DiscoveryWorker(QThread):
+    """Probe interpreters off the UI thread, reporting each one as it answers."""
+    found = Signal(int, str)
+
+    def run(self):
+        python_discovery.candidates(lambda position, candidate: self.found.emit(position, candidate.label()))
+
+class CatalogWorker(QThread):
+    """Load the version catalog off the UI thread (it may hit the network)."""
+    loaded = Signal(list)
+
+    def run(self):
+        self.loaded.emit(version_catalog.versions())
+
+class ClypInstallerGUI(QMainWindow):
+    """Main GUI window for Clyp installer wizard."""
+    
+    def __init__(self, python_path_arg=None, clyp_version_arg=None, uninstall=False, silent=False,
+                 options: Optional[InstallerOptions] = None):
+        super().__init__()
+        self.python_candidates: Optional[List[PythonCandidate]] = None
+        # Discovery positions of the combo items, to keep them in PATH order
+        self.python_positions: List[int] = []
+        self.python_combo_touched = False
+        # Set once closeEvent has detached the discovery and catalog workers
+        self.closing = False
+        self.current_page = 0
+        self.selected_python_path = None
+        self.selected_version = None
+        self.uninstall_mode = uninstall
+        self.silent = silent
+        self.python_path_arg = python_path_arg
+        self.clyp_version_arg = clyp_version_arg
+        self.options = options or InstallerOptions()
+        # Filled in by CatalogWorker; None until the catalog has loaded
+        self.catalog_versions: Optional[List[str]] = None
+        self.init_ui()
+
+        if self.uninstall_mode:
+            self.uninstall_checkbox.setChecked(True)
+        if self.clyp_version_arg:
+            self.version_combo.setCurrentText("Specify version...")
+            self.version_input.setText(self.clyp_version_arg)
+            self.version_input.setVisible(True)
+        if not self.silent:
+            self.start_discovery()
+        if not self.silent and not self.options.offline:
+            self.catalog_worker = CatalogWorker()
+            self.catalog_worker.loaded.connect(self.on_catalog_loaded)
+            self.catalog_worker.start()
+
+        # If silent, skip to install page and start installation
+        if self.silent:
+            if not self.python_path_arg:
+                self.load_python_candidates()
+            self.selected_python_path = self.python_path_arg or self.get_selected_python_path()
+            if not self.selected_python_path:
+                QMessageBox.critical(self, "Error", "Could not determine Python path for silent install.")
+                self.close()
+                return
+            if not self.uninstall_mode:
+                self.selected_version = self.clyp_version_arg or self.get_selected_version()
+            self.current_page = 2  # Install page (adjusted index)
+            self.stacked_widget.setCurrentIndex(self.current_page)
+            self.update_navigation()
+            self.start_installation()
+    
+    def init_ui(self):
+        self.setWindowTitle("Clyp Installer")
+        self.setGeometry(200, 200, 700, 550)
+        
+        # Apply dark mode styling
+        self.setStyleSheet(self.get_dark_stylesheet())
+        
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # Stacked widget for pages
+        self.stacked_widget = QStackedWidget()
+        main_layout.addWidget(self.stacked_widget)
+        
+        # Create pages (remove welcome page)
+        # self.create_welcome_page()
+        self.create_license_page()
+        self.create_options_page()
+        self.create_install_page()
+        self.create_finish_page()
+        
+        # Navigation buttons
+        nav_layout = QHBoxLayout()
+        nav_layout.setContentsMargins(20, 10, 20, 20)
+        
+        self.back_button = QPushButton("← Back")
+        self.back_button.clicked.connect(self.go_back)
+        self.back_button.setEnabled(False)
+        
+        nav_layout.addWidget(self.back_button)
+        nav_layout.addStretch()
+        
+        self.next_button = QPushButton("Next →")
+        self.next_button.clicked.connect(self.go_next)
+        
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_clicked)
+        
+        nav_layout.addWidget(self.next_button)
+        nav_layout.addWidget(self.cancel_button)
+        main_layout.addLayout(nav_layout)
+    
+    # Remove create_welcome_page method
+    # def create_welcome_page(self):
+    #     ...existing code...
+
+    def create_license_page(self):
+        """Create license agreement page."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(15)
+        
+        # Title
+        title = QLabel("License Agreement")
+        title.setAlignment(Qt.AlignCenter)
+        title.setFont(QFont("Arial", 20, QFont.Bold))
+        title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
+        layout.addWidget(title)
+        
+        # License text
+        license_text = QPlainTextEdit()
+        license_text.setReadOnly(True)
+        license_text.setPlainText(f"""
+Copyright {YEAR} codesoft
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the “Software”), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+        """.strip())
+        layout.addWidget(license_text)
+        
+        # Agreement checkbox
+        self.license_checkbox = QCheckBox("I accept the terms of the license agreement")
+        self.license_checkbox.toggled.connect(self.on_license_toggle)
+        layout.addWidget(self.license_checkbox)
+        
+        self.stacked_widget.addWidget(page)
+    
+    def create_options_page(self):
+        """Create installation options page."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(20)
+        
+        # Title
+        title = QLabel("Installation Options")
+        title.setAlignment(Qt.AlignCenter)
+        title.setFont(QFont("Arial", 20, QFont.Bold))
+        title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
+        layout.addWidget(title)
+        
+        # Python selection
+        python_label = QLabel("Select Python Installation:")
+        python_label.setFont(QFont("Arial", 12, QFont.Bold))
+        layout.addWidget(python_label)
+        
+        # Filled in by DiscoveryWorker as each interpreter answers
+        self.python_combo = QComboBox()
+        self.python_combo.activated.connect(self.on_python_activated)
+        layout.addWidget(self.python_combo)
+
+        self.discovery_status = QWidget()
+        status_layout = QHBoxLayout(self.discovery_status)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_label = QLabel("Looking for Python installations...")
+        status_label.setStyleSheet("color: #a0a0a0;")
+        status_layout.addWidget(status_label)
+        spinner = QProgressBar()
+        spinner.setRange(0, 0)  # busy indicator
+        spinner.setTextVisible(False)
+        spinner.setMaximumHeight(8)
+        status_layout.addWidget(spinner)
+        self.discovery_status.hide()
+        layout.addWidget(self.discovery_status)
+        
+        layout.addSpacing(15)
+        
+        # Uninstall option
+        self.uninstall_checkbox = QCheckBox("Uninstall Clyp instead of installing")
+        self.uninstall_checkbox.toggled.connect(self.on_uninstall_toggle)
+        layout.addWidget(self.uninstall_checkbox)
+        
+        layout.addSpacing(10)
+        
+        # Version selection
+        self.version_label = QLabel("Clyp Version:")
+        self.version_label.setFont(QFont("Arial", 12, QFont.Bold))
+        layout.addWidget(self.version_label)
+        
+        self.version_combo = QComboBox()
+        self.version_combo.addItem("Latest (recommended)")
+        self.version_combo.addItem("Specify version...")
+        self.version_combo.currentTextChanged.connect(self.on_version_change)
+        layout.addWidget(self.version_combo)
+        
+        # Custom version input
+        self.version_input = QLineEdit()
+        self.version_input.setPlaceholderText("Enter version (e.g., 1.2.3)")
+        self.version_input.hide()
+        layout.addWidget(self.version_input)
+        
+        layout.addStretch()
+        self.stacked_widget.addWidget(page)
+    
+    def create_install_page(self):
+        """Create installation progress page."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(20)
+        
+        # Title
+        self.install_title = QLabel("Installing Clyp...")
+        self.install_title.setAlignment(Qt.AlignCenter)
+        self.install_title.setFont(QFont("Arial", 20, QFont.Bold))
+        self.install_title.setStyleSheet("color: #e0e0e0; margin-bottom: 20px;")
+        layout.addWidget(self.install_title)
+        
+        # Progress bar, indeterminate until the first parsed progress event
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        layout.addWidget(self.progress_bar)
+        
+        # Status text
+        self.status_text = LogView()
+        self.status_text.setMaximumHeight(200)
+        layout.addWidget(self.status_text)
+        
+        layout.addStretch()
+        self.stacked_widget.addWidget(page)
+    
+    def create_finish_page(self):
+        """Create finish page."""
+        page = QWidget()
+        layout = QVBoxLayout(page)
+        layout.setContentsMargins(40, 40, 40, 40)
+        layout.setSpacing(20)
+        
+        # Title
+        self.finish_title = QLabel("Installation Complete!")
+        self.finish_title.setAlignment(Qt.AlignCenter)
+        self.finish_title.setFont(QFont("Arial", 24, QFont.Bold))
+        self.finish_title.setStyleSheet("color: #4CAF50; margin-bottom: 20px;")
+        layout.addWidget(self.finish_title)
+        
+        # Message
+        self.finish_message = QLabel("""
+        Clyp has been successfully installed!
+        
+        You can now use Clyp in your Python projects.
+        Restart your shell or IDE to ensure the installation is recognized.
+        
+        Thank you for using the Clyp installer.
+        """)
+        self.finish_message.setAlignment(Qt.AlignCenter)
+        self.finish_message.setWordWrap(True)
+        self.finish_message.setFont(QFont("Arial", 12))
+        self.finish_message.setStyleSheet("color: #b0b0b0; line-height: 1.4;")
+        layout.addWidget(self.finish_message)
+        
+        layout.addStretch()
+        self.stacked_widget.addWidget(page)
+    
+    def get_dark_stylesheet(self):
+        """Dark mode stylesheet."""
+        return """
+            QMainWindow {
+                background-color: #2b2b2b;
+                color: #e0e0e0;
+            }
+            QWidget {
+                background-color: #2b2b2b;
+                color: #e0e0e0;
+            }
+            QLabel {
+                color: #e0e0e0;
+                margin: 5px;
+            }
+            QPushButton {
+                background-color: #0078d4;
+                color: white;
+                border: none;
+                padding: 10px 20px;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 11px;
+                min-width: 80px;
+            }
+            QPushButton:hover {
+                background-color: #106ebe;
+            }
+            QPushButton:pressed {
+                background-color: #005a9e;
+            }
+            QPushButton:disabled {
+                background-color: #555;
+                color: #888;
+            }
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #555;
+                border-radius: 4px;
+                background-color: #3c3c3c;
+                color: #e0e0e0;
+                selection-background-color: #0078d4;
+            }
+            QComboBox::drop-down {
+                border: none;
+                width: 20px;
+            }
+            QComboBox::down-arrow {
+                image: none;
+                border-left: 5px solid transparent;
+                border-right: 5px solid transparent;
+                border-top: 5px solid #e0e0e0;
+                margin-right: 5px;
+            }
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #555;
+                border-radius: 4px;
+                background-color: #3c3c3c;
+                color: #e0e0e0;
+                selection-background-color: #0078d4;
+            }
+            QPlainTextEdit {
+                border: 1px solid #555;
+                border-radius: 4px;
+                background-color: #1e1e1e;
+                color: #e0e0e0;
+                font-family: 'Consolas', 'Monaco', monospace;
+                selection-background-color: #0078d4;
+            }
+            QProgressBar {
+                border: 1px solid #555;
+                border-radius: 4px;
+                background-color: #3c3c3c;
+                text-align: center;
+                color: #e0e0e0;
+            }
+            QProgressBar::chunk {
+                background-color: #0078d4;
+                border-radius: 3px;
+            }
+            QCheckBox {
+                color: #e0e0e0;
+                spacing: 8px;
+            }
+            QCheckBox::indicator {
+                width: 16px;
+                height: 16px;
+                border-radius: 3px;
+                border: 1px solid #555;
+                background-color: #3c3c3c;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #0078d4;
+                border-color: #0078d4;
+            }
+            QCheckBox::indicator:checked::after {
+                content: "✓";
+                color: white;
+                font-weight: bold;
+            }
+            QScrollArea {
+                border: none;
+                background-color: #2b2b2b;
+            }
+        """
+    
+    def on_license_toggle(self, checked):
+        """Handle license agreement toggle."""
+        if self.current_page == 1:  # License page
+            self.next_button.setEnabled(checked)
+    
+    def on_uninstall_toggle(self, checked):
+        """Toggle version selection visibility based on uninstall mode."""
+        self.uninstall_mode = checked
+        self.version_label.setVisible(not checked)
+        self.version_combo.setVisible(not checked)
+        if self.version_input.isVisible():
+            self.version_input.setVisible(not checked)
+    
+    def on_catalog_loaded(self, versions):
+        """List the released versions between "Latest" and "Specify version..."."""
+        self.catalog_versions = versions
+        for index, version in enumerate(versions, 1):
+            self.version_combo.insertItem(index, version)
+
+    def get_selected_version(self) -> Optional[str]:
+        """The version picked on the options page; None means latest."""
+        text = self.version_combo.currentText()
+        if "Specify version" in text:
+            return self.version_input.text().strip()
+        if text.startswith("Latest"):
+            return None
+        return text
+
+    def on_version_change(self, text):
+        """Show/hide custom version input based on selection."""
+        show_input = "Specify version" in text
+        self.version_input.setVisible(show_input)
+    
+    def go_back(self):
+        """Navigate to previous page."""
+        if self.current_page > 0:  # Adjusted: now first page is license
+            self.current_page -= 1
+            self.stacked_widget.setCurrentIndex(self.current_page)
+            self.update_navigation()
+    
+    def discovery_running(self) -> bool:
+        return getattr(self, "discovery_worker", None) is not None and self.discovery_worker.isRunning()
+
+    def start_discovery(self):
+        """Probe interpreters in a worker while the license page is shown.
+
+        Each interpreter is added to the combo as soon as its probe answers.
+        """
+        if self.python_path_arg:
+            self.load_python_candidates()
+            return
+        self.discovery_status.show()
+        self.discovery_worker = DiscoveryWorker()
+        self.discovery_worker.found.connect(self.on_candidate_found)
+        self.discovery_worker.finished.connect(self.on_discovery_done)
+        self.discovery_worker.start()
+
+    def on_candidate_found(self, position, label):
+        """Insert an interpreter in PATH order; keep the first one selected until the user picks."""
+        index = bisect.bisect(self.python_positions, position)
+        self.python_positions.insert(index, position)
+        self.python_combo.insertItem(index, label)
+        if not self.python_combo_touched:
+            self.python_combo.setCurrentIndex(0)
+
+    def on_python_activated(self, index):
+        self.python_combo_touched = True
+
+    def on_discovery_done(self):
+        self.discovery_status.hide()
+        self.python_candidates = python_discovery.candidates()
+        if not self.python_candidates and self.current_page >= 1:
+            self.show_no_python_error()
+
+    def load_python_candidates(self):
+        """Fill the Python combo synchronously, running interpreter discovery on first use.
+
+        An interpreter passed with --python is used as-is and discovery is
+        skipped entirely.
+        """
+        if self.python_candidates is not None:
+            return
+        if self.python_path_arg:
+            self.python_candidates = []
+            self.python_combo.addItem(f"Specified interpreter ({self.python_path_arg})")
+            return
+        self.python_candidates = python_discovery.candidates()
+        for candidate in self.python_candidates:
+            self.python_combo.addItem(candidate.label())
+        if not self.python_candidates:
+            self.show_no_python_error()
+    
+    def go_next(self):
+        """Navigate to next page or start installation."""
+        if self.current_page == 0 and self.python_candidates == [] and not self.python_path_arg:
+            self.show_no_python_error()
+            return
+        if self.current_page == 1:  # Options page (was 2, now 1)
+            # Validate and store options
+            self.selected_python_path = self.get_selected_python_path()
+            if not self.selected_python_path and self.discovery_running():
+                QMessageBox.information(self, "Please Wait",
+                                        "Still looking for Python installations. Try again in a moment.")
+                return
+            if not self.selected_python_path:
+                QMessageBox.warning(self, "Error", "Could not determine Python path.")
+                return
+            
+            if not self.uninstall_mode:
+                self.selected_version = self.get_selected_version()
+                if self.selected_version == "":
+                    QMessageBox.warning(self, "Error", "Please enter a version number.")
+                    return
+                if self.selected_version and version_key(self.selected_version) is None:
+                    QMessageBox.warning(self, "Error", f"{self.selected_version!r} is not a valid version number.")
+                    return
+                if self.selected_version and self.catalog_versions and not any(
+                        same_version(version, self.selected_version)
+                        for version in self.catalog_versions):
+                    QMessageBox.warning(self, "Unknown Version",
+                                        f"Clyp {self.selected_version} is not available. "
+                                        f"Recent versions: {', '.join(self.catalog_versions[:5])}")
+                    return
+            
+            # Move to install page and start installation
+            self.current_page += 1
+            self.stacked_widget.setCurrentIndex(self.current_page)
+            self.update_navigation()
+            self.start_installation()
+        elif self.current_page < 3:
+            self.current_page += 1
+            self.stacked_widget.setCurrentIndex(self.current_page)
+            self.update_navigation()
+        elif self.current_page == 3:  # Finish page
+            self.close()
+    
+    def update_navigation(self):
+        """Update navigation button states."""
+        if self.current_page == 0:  # License page - show Back disabled, Next enabled if checked
+            self.back_button.setVisible(True)
+            self.next_button.setVisible(True)
+            self.back_button.setEnabled(False)
+            self.next_button.setEnabled(self.license_checkbox.isChecked())
+            self.next_button.setText("Next →")
+            self.cancel_button.setEnabled(True)
+        else:
+            self.back_button.setVisible(True)
+            self.next_button.setVisible(True)
+            self.back_button.setEnabled(self.current_page > 0 and self.current_page != 2)
+            
+            if self.current_page == 1:  # Options page
+                self.next_button.setEnabled(True)
+                self.next_button.setText("Next →")
+                self.cancel_button.setEnabled(True)
+            elif self.current_page == 2:  # Install page
+                self.next_button.setEnabled(False)
+                self.cancel_button.setEnabled(True)
+            elif self.current_page == 3:  # Finish page
+                self.next_button.setText("Finish")
+                self.cancel_button.setEnabled(False)
+            else:
+                self.next_button.setEnabled(True)
+                if self.current_page < 3:
+                    self.next_button.setText("Next →")
+    
+    def show_no_python_error(self):
+        """Show error when no Python installations are found."""
+        QMessageBox.critical(self, "No Python Found", 
+                           "No Python installations found on your system.\n"
+                           "Please install Python from https://www.python.org/downloads/")
+        self.close()
+    
+    def get_selected_python_path(self):
+        """Extract Python path from selected combo item."""
+        selected_text = self.python_combo.currentText()
+        if "(" in selected_text and ")" in selected_text:
+            return selected_text.split("(")[-1].strip(")")
+        return None
+    
+    def installation_running(self) -> bool:
+        return getattr(self, "worker", None) is not None and self.worker.isRunning()
+
+    def cancel_clicked(self):
+        """Cancel a running installation, or close the wizard otherwise."""
+        if self.installation_running():
+            self.cancel_button.setEnabled(False)
+            self.status_text.write("Cancelling...")
+            self.worker.cancel()
+        else:
+            self.close()
+
+    def closeEvent(self, event):
+        """Stop a running installation before closing so no installer process is left behind."""
+        if self.installation_running():
+            self.worker.cancel()
+            self.worker.wait()
+        if not self.closing:
+            # A probe or index request cannot be interrupted, so do not wait for
+            # them here: drop their results and let run() wait once the window is gone.
+            self.closing = True
+            if getattr(self, "catalog_worker", None) is not None:
+                self.catalog_worker.loaded.disconnect(self.on_catalog_loaded)
+            if getattr(self, "discovery_worker", None) is not None:
+                self.discovery_worker.found.disconnect(self.on_candidate_found)
+                self.discovery_worker.finished.disconnect(self.on_discovery_done)
+        self.status_text.close_spill()
+        super().closeEvent(event)
+
+    def wait_for_lookups(self):
+        """Block until the discovery and catalog workers have ended."""
+        for worker in (getattr(self, "catalog_worker", None), getattr(self, "discovery_worker", None)):
+            if worker is not None:
+                worker.wait()
+
+    def start_installation(self):
+        """Start the installation process."""
+        self.install_title.setText("Uninstalling Clyp..." if self.uninstall_mode else "Installing Clyp...")
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        self.status_text.start(new_log_path())
+        
+        # Start worker thread
+        self.worker = InstallWorker(self.selected_python_path, self.selected_version, self.uninstall_mode,
+                                    self.options)
+        self.worker.progress.connect(self.update_progress)
+        self.worker.progress_value.connect(self.update_progress_value)
+        self.worker.finished.connect(self.installation_finished)
+        self.worker.start()
+    
+    def update_progress(self, message):
+        """Queue a log line; LogView writes it to the pane on its next flush."""
+        self.status_text.write(message)
+    
+    def update_progress_value(self, percent, status):
+        """Switch the progress bar to determinate mode and show phase/ETA."""
+        if self.progress_bar.maximum() == 0:
+            self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"%p% - {status}")
+    
+    def installation_finished(self, success, message):
+        """Handle installation completion."""
+        self.status_text.close_spill()
+        log_path = self.status_text.spill_path
+        log_note = f"\n\nFull log: {log_path}" if log_path else ""
+        if success:
+            self.finish_title.setText("Success!")
+            self.finish_title.setStyleSheet("color: #4CAF50; margin-bottom: 20px;")
+            self.finish_message.setText(message + "\n\nYou can now close this installer." + log_note)
+        elif self.worker.engine.status == "cancelled":
+            self.finish_title.setText("Installation Cancelled")
+            self.finish_title.setStyleSheet("color: #FF9800; margin-bottom: 20px;")
+            self.finish_message.setText(f"{message}\n\nYou can run the installer again at any time.{log_note}")
+        else:
+            self.finish_title.setText("Installation Failed")
+            self.finish_title.setStyleSheet("color: #f44336; margin-bottom: 20px;")
+            log_hint = f"the full log in {log_path}" if log_path else "the installation log"
+            self.finish_message.setText(f"Error: {message}\n\nPlease check {log_hint}.")
+        
+        # Move to finish page
+        self.current_page = 3
+        self.stacked_widget.setCurrentIndex(self.current_page)
+        self.update_navigation()
+
+def run(options: InstallerOptions) -> int:
+    """Show the installer wizard and run the Qt event loop."""
+    app = QApplication(sys.argv)
+    window = ClypInstallerGUI(
+        python_path_arg=options.python_path,
+        clyp_version_arg=options.clyp_version,
+        uninstall=options.uninstall,
+        silent=options.silent,
+        options=options
+    )
+    window.show()
+    code = app.exec()
+    # The window is already gone; background lookups may still be finishing
+    window.wait_for_lookups()
+    return code
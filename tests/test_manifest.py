@@ -0,0 +1,78 @@
+"""Manifest loading and prefetch grouping."""
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+import install
+
+
+def write_manifest(tmp_path, manifest, name="clyp.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(manifest) if isinstance(manifest, dict) else manifest)
+    return str(path)
+
+
+def test_defaults_and_paths(tmp_path):
+    path = write_manifest(tmp_path, {
+        "defaults": {"version": "2.1.0"},
+        "targets": [
+            {"venv": "envs/a"},
+            {"python": "bin/python3", "action": "uninstall", "version": "latest"},
+        ],
+    })
+    first, second = install.load_manifest(path)
+    assert first.python == install.venv_python(str(tmp_path / "envs" / "a"))
+    assert first.version == "2.1.0" and first.action == "install"
+    assert second.python == os.path.join(str(tmp_path), "bin", "python3")
+    assert second.version is None and second.action == "uninstall"
+
+
+def test_bare_interpreter_name_is_looked_up_on_path(tmp_path):
+    name = os.path.basename(sys.executable)
+    path = write_manifest(tmp_path, {"targets": [{"python": name}]})
+    (target,) = install.load_manifest(path)
+    assert target.python == shutil.which(name)
+
+
+@pytest.mark.parametrize("manifest, message", [
+    ({"targets": [{"python": "/usr/bin/python3"}, {"python": "/usr/bin/../bin/python3"}]}, "more than once"),
+    ({"targets": [{"python": "/usr/bin/python3", "action": "upgrade"}]}, "action must be one of"),
+    ({"targets": [{"version": "1.0"}]}, 'needs "python" or "venv"'),
+    ({"targets": ["/usr/bin/python3"]}, "not a table"),
+    ({"interpreters": []}, '"targets" list'),
+])
+def test_malformed_manifests(tmp_path, manifest, message):
+    with pytest.raises(ValueError, match=message):
+        install.load_manifest(write_manifest(tmp_path, manifest))
+
+
+def test_toml_needs_tomllib(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "tomllib", None)  # as on Python < 3.11
+    path = write_manifest(tmp_path, '[[targets]]\npython = "/usr/bin/python3"\n', "clyp.toml")
+    with pytest.raises(ValueError, match="3.11"):
+        install.load_manifest(path)
+
+
+def record(soabi="cpython-311-x86_64-linux-gnu", clyp=None):
+    return {"implementation": "CPython", "soabi": soabi, "version": "3.11.7", "sys_platform": "linux",
+            "machine": "x86_64", "distributions": {"clyp": clyp} if clyp else {}}
+
+
+def test_plan_prefetch_groups_matching_installs():
+    a, b, c, d, e, f = (install.ManifestTarget(f"/py/{name}", None, "install") for name in "abcdef")
+    pinned = install.ManifestTarget("/py/g", "2.0.0", "install")
+    removed = install.ManifestTarget("/py/h", None, "uninstall")
+    records = {
+        a: record(), b: record(), e: record(),
+        c: record(soabi="cpython-313-x86_64-linux-gnu"),  # the only one with its ABI
+        d: record(clyp="2.1.0"),  # already up to date
+        f: None,  # could not be probed
+        pinned: record(), removed: record(),
+    }
+    groups = install.plan_prefetch(list(records), records, latest="2.1.0")
+    assert groups == [[a, b, e]]
+    forced = install.plan_prefetch(list(records), records, latest="2.1.0", force=True)
+    assert forced == [[a, b, e, d]]
@@ -0,0 +1,61 @@
+"""Version matching used to decide whether clyp is already installed."""
+import pytest
+
+import install
+
+
+@pytest.mark.parametrize("installed, wanted", [
+    ("1.0rc1", "1.0"),
+    ("2.0.0.dev3", "2.0.0"),
+    ("1.2.3.post1", "1.2.3"),
+    ("1.2.3", "1.2.3x"),
+])
+def test_different_releases_do_not_match(installed, wanted):
+    assert not install.same_version(installed, wanted)
+
+
+@pytest.mark.parametrize("installed, wanted", [
+    ("2.1.0", "2.1"),
+    ("1.0RC1", "1.0rc1"),
+    ("1.0-1", "1.0.post1"),
+    ("1.0+local", "1.0"),
+])
+def test_equivalent_versions_match(installed, wanted):
+    assert install.same_version(installed, wanted)
+
+
+@pytest.mark.parametrize("installed, wanted, satisfied", [
+    ("1.0rc1", "1.0", False),
+    ("2.0.0.dev3", "2.0.0", False),
+    ("1.2.3.post1", "1.2.3", False),
+    ("1.2.3", "1.2.3", True),
+])
+def test_already_satisfied(monkeypatch, installed, wanted, satisfied):
+    monkeypatch.setattr(install, "installed_clyp_version", lambda python_path: installed)
+    engine = install.InstallEngine("python", wanted, uninstall=False)
+    assert engine.already_satisfied() == (installed if satisfied else None)
+
+
+def test_verify_rejects_prerelease(monkeypatch):
+    monkeypatch.setattr(install, "installed_clyp_version", lambda python_path: "1.0rc1")
+    backend = install.PipBackend("python")
+    assert not backend.verify("1.0")
+    assert backend.verify("1.0rc1")
+
+
+@pytest.mark.parametrize("version, specifier, satisfied", [
+    ("1.0rc1", ">=1.0", False),
+    ("1.0.post1", ">=1.0", True),
+    ("2.0rc1", "<2.0", False),
+    ("1.0.post1", ">1.0", False),
+    ("3.13.0+", ">=3.8", True),
+    ("2.3", "~=2.2.0", False),
+    ("1.3.2", "!=1.3.*", False),
+])
+def test_version_satisfies_orders_pre_and_post_releases(version, specifier, satisfied):
+    assert install.version_satisfies(version, specifier) == satisfied
+
+
+def test_version_order():
+    versions = ["1.0.1", "1.0.post1", "1.0", "1.0rc1", "1.0a1", "1.0.dev1"]
+    assert sorted(versions, key=install.version_order) == list(reversed(versions))
@@ -0,0 +1,96 @@
+"""WheelBackend unpacking and RECORD-based removal in a throwaway venv."""
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import install
+
+
+def build_wheel(directory, files, requires_python=""):
+    """Write clyp-1.0-py3-none-any.whl with the given {name: text} files."""
+    dist_info = "clyp-1.0.dist-info"
+    metadata = "Metadata-Version: 2.1\nName: clyp\nVersion: 1.0\n"
+    if requires_python:
+        metadata += f"Requires-Python: {requires_python}\n"
+    path = os.path.join(directory, "clyp-1.0-py3-none-any.whl")
+    with zipfile.ZipFile(path, "w") as wheel:
+        for name, text in files.items():
+            wheel.writestr(name, text)
+        wheel.writestr(f"{dist_info}/METADATA", metadata)
+        wheel.writestr(f"{dist_info}/WHEEL", "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+        wheel.writestr(f"{dist_info}/entry_points.txt", "[console_scripts]\nclyp = clyp:main\n")
+        wheel.writestr(f"{dist_info}/RECORD", "")
+    return path
+
+
+@pytest.fixture
+def venv(tmp_path, monkeypatch):
+    monkeypatch.setattr(install.interpreter_cache, "enabled", False)
+    subprocess.check_call([sys.executable, "-m", "venv", "--without-pip", str(tmp_path / "venv")])
+    bin_dir = "Scripts" if os.name == "nt" else "bin"
+    python = str(tmp_path / "venv" / bin_dir / ("python.exe" if os.name == "nt" else "python"))
+    return python, install.introspect_python(python, refresh=True)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="console scripts are left to pip on Windows")
+def test_install_and_remove(tmp_path, venv):
+    python, record = venv
+    backend = install.WheelBackend(python)
+    wheel = build_wheel(str(tmp_path), {"clyp/__init__.py": "def main():\n    print('hi')\n"})
+    backend.install_wheel(wheel, record)
+
+    site_dir = record["purelib"]
+    dist_info = os.path.join(site_dir, "clyp-1.0.dist-info")
+    assert os.path.isfile(os.path.join(site_dir, "clyp", "__init__.py"))
+    assert os.path.isfile(os.path.join(dist_info, "RECORD"))
+    assert open(os.path.join(dist_info, "INSTALLER")).read() == "clypinstaller\n"
+    script = os.path.join(record["scripts"], "clyp")
+    assert subprocess.check_output([script]).decode().strip() == "hi"
+
+    record = install.introspect_python(python, refresh=True)
+    assert record["clyp"] == "1.0"
+    assert backend.remove_installed(record) > 0
+    assert not os.path.exists(os.path.join(site_dir, "clyp"))
+    assert not os.path.exists(dist_info)
+    assert not os.path.exists(script)
+
+
+def test_install_rejects_paths_outside_site_packages(tmp_path, venv):
+    python, record = venv
+    wheel = build_wheel(str(tmp_path), {"../escaped.py": "x = 1\n"})
+    with pytest.raises(install.BackendSkipped):
+        install.WheelBackend(python).install_wheel(wheel, record)
+    assert not os.path.exists(os.path.join(os.path.dirname(record["purelib"]), "escaped.py"))
+
+
+def test_install_rejects_unsupported_python(tmp_path, venv):
+    python, record = venv
+    wheel = build_wheel(str(tmp_path), {"clyp/__init__.py": ""}, requires_python=">=99")
+    with pytest.raises(install.BackendSkipped):
+        install.WheelBackend(python).install_wheel(wheel, record)
+    assert not os.path.exists(os.path.join(record["purelib"], "clyp"))
+
+
+def test_remove_rejects_record_escaping_the_environment(tmp_path, venv):
+    python, record = venv
+    site_dir = record["purelib"]
+    os.makedirs(os.path.join(site_dir, "clyp"))
+    package = os.path.join(site_dir, "clyp", "__init__.py")
+    open(package, "w").close()
+    outside = tmp_path / "outside.txt"
+    outside.write_text("keep me")
+    dist_info = os.path.join(site_dir, "clyp-1.0.dist-info")
+    os.makedirs(dist_info)
+    escape = os.path.relpath(str(outside), site_dir).replace(os.sep, "/")
+    with open(os.path.join(dist_info, "RECORD"), "w") as f:
+        f.write(f"clyp/__init__.py,,\n{escape},,\nclyp-1.0.dist-info/RECORD,,\n")
+
+    record = install.introspect_python(python, refresh=True)
+    with pytest.raises(install.BackendSkipped):
+        install.WheelBackend(python).remove_installed(record)
+    assert outside.read_text() == "keep me"
+    assert os.path.exists(package)
+    assert os.path.exists(dist_info)